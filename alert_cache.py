@@ -0,0 +1,34 @@
+# alert_cache.py
+# Version tag (ETag) for the /get_alerts listing, so admin consoles polling an
+# unchanged list get 304 Not Modified without a query.
+# Every code path that writes the alerts table calls invalidate_alerts()
+# after its commit.
+
+import itertools
+import time
+import uuid
+
+# Writes from other processes (other workers, fix_alerts.py) can't bump the
+# version here, so a tag is also retired after this long
+ALERTS_ETAG_TTL = 30  # seconds
+
+# Per-process prefix: a tag issued by another worker or before a restart never matches
+ALERTS_ETAG_PREFIX = uuid.uuid4().hex[:8]
+alerts_version_seq = itertools.count(1)
+alerts_version = 0
+alerts_version_ts = time.monotonic()
+
+
+def current_alerts_etag():
+    """ETag (unquoted) for the alerts listing as of now"""
+    if time.monotonic() - alerts_version_ts > ALERTS_ETAG_TTL:
+        invalidate_alerts()
+    return f"{ALERTS_ETAG_PREFIX}-{alerts_version}"
+
+
+def invalidate_alerts():
+    """Mark the alerts listing as changed"""
+    global alerts_version, alerts_version_ts
+    # next() on itertools.count is atomic under the GIL
+    alerts_version = next(alerts_version_seq)
+    alerts_version_ts = time.monotonic()
@@ -0,0 +1,56 @@
+# alert_pagination.py
+# Opt-in keyset pagination for the alert blueprint's listings
+
+from datetime import datetime
+from flask import request
+from sqlalchemy import or_, and_
+from model.alert_model import Alert
+
+ALERT_PAGE_MAX_LIMIT = 500
+
+
+def paginate_alerts(query):
+    """
+    Apply optional keyset pagination from ?limit=&before=&before_id= to an
+    alert query ordered newest first. Returns (query, limit); limit is None
+    when the caller didn't ask for a page and the full list is returned.
+    Raises ValueError on malformed parameters.
+    """
+    limit = request.args.get('limit', type=int)
+    before = request.args.get('before')
+    before_id = request.args.get('before_id', type=int)
+    
+    query = query.order_by(Alert.timestamp.desc(), Alert.id.desc())
+    
+    if before:
+        before_ts = datetime.fromisoformat(before)
+        if before_id is not None:
+            query = query.filter(or_(
+                Alert.timestamp < before_ts,
+                and_(Alert.timestamp == before_ts, Alert.id < before_id)
+            ))
+        else:
+            query = query.filter(Alert.timestamp < before_ts)
+    
+    if limit is None and not before:
+        return query, None
+    
+    limit = max(1, min(limit or 50, ALERT_PAGE_MAX_LIMIT))
+    return query.limit(limit), limit
+
+
+def next_page_cursor(last_row, count, limit):
+    """Cursor for the page after last_row, or None when there is no next page"""
+    if limit is None or count < limit or last_row is None or not last_row.timestamp:
+        return None
+    return {
+        'next_before': last_row.timestamp.isoformat(),
+        'next_before_id': last_row.id
+    }
+
+
+def track_last(rows, last):
+    """Yield rows unchanged while remembering the most recent one in last[0]"""
+    for row in rows:
+        last[0] = row
+        yield row
@@ -1,28 +1,45 @@
 #app.py
 
-from flask import Flask, jsonify, request, render_template, send_from_directory, Response, stream_with_context
+from flask import Flask, jsonify, request, render_template, send_from_directory, Response, stream_with_context, g
 from flask_cors import CORS
+from flask_compress import Compress
+from flask.json.provider import JSONProvider
+from werkzeug.utils import safe_join
+from urllib.parse import quote
 import os
 import requests 
-import traceback
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+import sys
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta, timezone
-import json
+from decimal import Decimal
+import orjson
 import time
 import math
-from queue import Queue
-from threading import Lock
+import itertools
+import uuid
+import atexit
+from functools import lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, SimpleQueue, Full, Empty
+from threading import Lock, Thread
 from onesignal_service import send_push_notification
+from notification_cache import invalidate_notifications
+from alert_cache import invalidate_alerts
 
-from sqlalchemy import text
+from sqlalchemy import text, select, update, delete
 
 # Import your database setup
 from model.user import User
 from model.admin_model import Admin
 from model.alert_model import Alert
 from model.notification_model import Notification  
-from database import init_db, db
+from database import init_db, ensure_indexes, db
 from route.register_route import register_bp
-from route.alert_route import alert_bp
+from route.alert_route import alert_bp, alert_media_ids, delete_media
 from route.settings_route import settings_bp
 from route.adminauth_route import login_bp
 from route.userauth_route import auth_bp
@@ -33,10 +50,29 @@ from route.notification_route import notification_bp
 from dotenv import load_dotenv
 
 # Import Cloudinary functions
-from cloudinary_config import init_cloudinary, upload_to_cloudinary, delete_from_cloudinary
+from cloudinary_config import init_cloudinary, upload_to_cloudinary
 
 load_dotenv()
 
+# ========================================
+# LOGGING
+# ========================================
+
+# Request threads only enqueue log records; a single listener thread does the
+# blocking write to stdout
+log_queue = Queue(-1)
+log_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+    format='%(message)s',
+    handlers=[QueueHandler(log_queue)],
+    force=True
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger('backend')
+
 # Philippine timezone is UTC+8
 PHILIPPINE_OFFSET = timedelta(hours=8)
 PHILIPPINE_TZ = timezone(PHILIPPINE_OFFSET)
@@ -53,6 +89,16 @@ def get_philippine_timestamp():
     """Get current timestamp in Philippine timezone"""
     return int(get_philippine_time().timestamp())
 
+def now_ph():
+    """
+    Philippine time for the current request as (datetime, iso string, timestamp),
+    computed once and reused by every caller in the same request
+    """
+    if 'ph_now' not in g:
+        now = get_philippine_time()
+        g.ph_now = (now, now.isoformat(), int(now.timestamp()))
+    return g.ph_now
+
 
 
 app = Flask(__name__)
@@ -72,17 +118,35 @@ CORS(
     }
 )
 
+
+@app.before_request
+def cors_preflight():
+    """Answer every CORS preflight here; Flask-CORS adds the headers on the way out"""
+    if request.method == 'OPTIONS':
+        return '', 204
+
 # Secret key
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
 
+# Response compression for JSON (alert lists, routes, notifications).
+# text/event-stream is left out on purpose: a compressor buffers output,
+# which would hold back SSE frames until enough bytes accumulate.
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = 'gzip'
+app.config['COMPRESS_LEVEL'] = 1
+# Streamed listings go out uncompressed: Flask-Compress would otherwise
+# call get_data() on them and buffer the whole body before sending
+app.config['COMPRESS_STREAMS'] = False
+Compress(app)
+
 
 # Initialize Cloudinary
 try:
     init_cloudinary()
-    print("✅ Cloudinary initialized successfully!")
-    print(f"Cloud Name: {os.getenv('CLOUDINARY_CLOUD_NAME')}")
+    logger.info("✅ Cloudinary initialized successfully!")
+    logger.info("Cloud Name: %s", os.getenv('CLOUDINARY_CLOUD_NAME'))
 except Exception as e:
-    print(f"❌ Cloudinary initialization failed: {e}")
+    logger.error("❌ Cloudinary initialization failed: %s", e)
 
 # Uploads folder
 UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
@@ -101,53 +165,198 @@ app.register_blueprint(notification_bp)
 app.register_blueprint(settings_bp)
 
 
+# ========================================
+# JSON HELPERS
+# ========================================
+
+def orjson_default(obj):
+    """Fallback for the few types orjson can't serialize natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson so every jsonify()/request.get_json()
+    goes through the C serializer. Naive datetimes are emitted without an
+    offset, matching the .isoformat() strings the endpoints already return.
+    """
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=orjson_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=orjson_default, option=self.option),
+            mimetype='application/json'
+        )
+
+
+app.json = OrjsonProvider(app)
+
+
+# ========================================
+# BACKGROUND TASKS
+# ========================================
+
+# Network-bound side effects (push notifications, ...) run here so the HTTP
+# response is sent as soon as the database commit is done
+background_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='background')
+
+def run_in_background(func, *args, **kwargs):
+    """Run func on the background pool inside an app context; errors are logged"""
+    def task():
+        with app.app_context():
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.exception("❌ Background task %s failed: %s", func.__name__, e)
+    return background_executor.submit(task)
+
+
 # ========================================
 # SSE NOTIFICATION SYSTEM
 # ========================================
 
+# Max frames buffered per connection before the oldest ones are dropped
+SSE_QUEUE_MAXSIZE = 256
+
+# Seconds of inactivity before a heartbeat comment keeps the stream open
+SSE_HEARTBEAT_INTERVAL = 30
+
+# Fixed frames, encoded once at import
+SSE_HEARTBEAT_FRAME = b": heartbeat\n\n"
+SSE_CONNECTED_FRAME = b'data: {"type":"connected","message":"SSE connection established"}\n\n'
+
 # Store active SSE connections for each user
-# Format: {user_id: [Queue(), Queue(), ...]}
+# Format: {user_id: (Queue(), Queue(), ...)}
+# Tuples are never mutated in place - writers build a new tuple under the
+# per-user lock and swap it in, so readers can iterate a snapshot lock-free.
 active_sse_connections = {}
-sse_lock = Lock()
-
-def add_sse_connection(user_id, queue):
-    """Add a new SSE connection for a user"""
+sse_user_locks = {}
+sse_lock = Lock()  # guards creation and removal of per-user locks
+
+@contextmanager
+def sse_user_lock(user_id):
+    """Hold the lock guarding a single user's connections"""
+    while True:
+        lock = sse_user_locks.get(user_id)
+        if lock is None:
+            with sse_lock:
+                lock = sse_user_locks.setdefault(user_id, Lock())
+        lock.acquire()
+        # The lock may have been retired (see set_sse_connections) while we
+        # waited for it; if so, start over with the user's current lock
+        if sse_user_locks.get(user_id) is lock:
+            break
+        lock.release()
+    try:
+        yield
+    finally:
+        lock.release()
+
+def set_sse_connections(user_id, queues):
+    """Store a user's connection tuple; call with sse_user_lock(user_id) held"""
+    if queues:
+        active_sse_connections[user_id] = queues
+        return
+    active_sse_connections.pop(user_id, None)
+    # Last connection gone - retire the user's lock so the dict doesn't grow
+    # with every user who ever connected
     with sse_lock:
-        if user_id not in active_sse_connections:
-            active_sse_connections[user_id] = []
-        active_sse_connections[user_id].append(queue)
-        print(f"📡 SSE connection added for user {user_id}. Total: {len(active_sse_connections[user_id])}")
+        sse_user_locks.pop(user_id, None)
+
+def add_sse_connection(user_id):
+    """Add a new SSE connection for a user and return its queue"""
+    # Each connection gets its own queue; queues are never reused, so a stale
+    # snapshot can't deliver one user's frame to another user's stream
+    queue = Queue(maxsize=SSE_QUEUE_MAXSIZE)
+    with sse_user_lock(user_id):
+        queues = active_sse_connections.get(user_id, ()) + (queue,)
+        set_sse_connections(user_id, queues)
+    logger.info("📡 SSE connection added for user %s. Total: %s", user_id, len(queues))
+    return queue
 
 def remove_sse_connection(user_id, queue):
     """Remove an SSE connection for a user"""
-    with sse_lock:
-        if user_id in active_sse_connections:
-            try:
-                active_sse_connections[user_id].remove(queue)
-                if not active_sse_connections[user_id]:
-                    del active_sse_connections[user_id]
-                print(f"📡 SSE connection removed for user {user_id}")
-            except ValueError:
-                pass
+    with sse_user_lock(user_id):
+        queues = active_sse_connections.get(user_id, ())
+        if queue not in queues:
+            return
+        set_sse_connections(user_id, tuple(q for q in queues if q is not queue))
+    logger.info("📡 SSE connection removed for user %s", user_id)
+
+# Request handlers only enqueue (user_id, notification) here; a single
+# dispatcher thread does the serialization and fan-out to subscriber queues
+sse_outbox = SimpleQueue()
+sse_dispatcher = None
+sse_dispatcher_lock = Lock()
+
+def start_sse_dispatcher():
+    """Start the dispatcher thread (lazily, so it is created after any worker fork)"""
+    global sse_dispatcher
+    if sse_dispatcher is not None and sse_dispatcher.is_alive():
+        return
+    with sse_dispatcher_lock:
+        if sse_dispatcher is None or not sse_dispatcher.is_alive():
+            sse_dispatcher = Thread(target=sse_dispatcher_loop, daemon=True)
+            sse_dispatcher.start()
+
+def sse_dispatcher_loop():
+    """Deliver queued notifications forever"""
+    while True:
+        user_id, notification_data = sse_outbox.get()
+        try:
+            dispatch_sse_notification(user_id, notification_data)
+        except Exception as e:
+            logger.error("❌ SSE dispatch error for user %s: %s", user_id, e)
 
 def send_sse_notification(user_id, notification_data):
+    """Queue a notification for all active SSE connections of a user"""
+    # Atomic dict read - users with no open stream cost nothing
+    if not active_sse_connections.get(user_id):
+        return
+    start_sse_dispatcher()
+    sse_outbox.put((user_id, notification_data))
+
+def dispatch_sse_notification(user_id, notification_data):
     """Send notification to all active SSE connections for a user"""
-    with sse_lock:
-        if user_id in active_sse_connections:
-            dead_queues = []
-            for queue in active_sse_connections[user_id]:
-                try:
-                    queue.put(notification_data)
-                    print(f"📤 SSE notification sent to user {user_id}")
-                except:
-                    dead_queues.append(queue)
-            
-            # Clean up dead connections
-            for dead_queue in dead_queues:
+    # Atomic dict read - iterate the snapshot without holding any lock
+    queues = active_sse_connections.get(user_id)
+    if not queues:
+        return
+
+    # Serialize once per broadcast, not once per subscriber
+    frame = b"data: " + orjson.dumps(notification_data) + b"\n\n"
+
+    dead_queues = []
+    for queue in queues:
+        try:
+            try:
+                queue.put_nowait(frame)
+            except Full:
+                # Slow consumer - drop the oldest frame instead of growing forever
                 try:
-                    active_sse_connections[user_id].remove(dead_queue)
-                except ValueError:
+                    queue.get_nowait()
+                except Empty:
                     pass
+                queue.put_nowait(frame)
+                logger.warning("⚠️ SSE queue full for user %s, dropped oldest frame", user_id)
+            logger.info("📤 SSE notification sent to user %s", user_id)
+        except:
+            dead_queues.append(queue)
+
+    # Clean up dead connections
+    if dead_queues:
+        with sse_user_lock(user_id):
+            current = active_sse_connections.get(user_id, ())
+            set_sse_connections(user_id, tuple(q for q in current if q not in dead_queues))
 
 # app.py - FIXED SSE Endpoint
 
@@ -158,27 +367,26 @@ def sse_notifications(user_id):
     Client connects here to receive notifications instantly
     """
     def event_stream():
-        queue = Queue()
-        add_sse_connection(user_id, queue)
+        queue = add_sse_connection(user_id)
         
         try:
             # Send initial connection confirmation
-            yield f"data: {json.dumps({'type': 'connected', 'message': 'SSE connection established'})}\n\n"
+            yield SSE_CONNECTED_FRAME
             
             # Keep connection alive and send notifications
             while True:
                 try:
-                    # Wait for notification with timeout
-                    notification = queue.get(timeout=30)
-                    yield f"data: {json.dumps(notification)}\n\n"
-                except:
+                    # Wait for notification with timeout (already-encoded frame)
+                    frame = queue.get(timeout=SSE_HEARTBEAT_INTERVAL)
+                except Empty:
                     # Send heartbeat every 30 seconds to keep connection alive
-                    yield f": heartbeat\n\n"
+                    frame = SSE_HEARTBEAT_FRAME
+                yield frame
                     
         except GeneratorExit:
-            print(f"📡 SSE connection closed for user {user_id}")
+            logger.info("📡 SSE connection closed for user %s", user_id)
         except Exception as e:
-            print(f"❌ SSE error for user {user_id}: {e}")
+            logger.error("❌ SSE error for user %s: %s", user_id, e)
         finally:
             remove_sse_connection(user_id, queue)
     
@@ -203,384 +411,376 @@ def sse_notifications(user_id):
 # SSE HEALTH CHECK
 # ========================================
 
+SSE_HEALTH_CACHE_TTL = 1  # seconds
+sse_health_cache = {'ts': 0.0, 'body': None}
+
 @app.route('/sse/health')
 def sse_health():
     """Check SSE system status"""
-    with sse_lock:
-        return jsonify({
-            'active_connections': len(active_sse_connections),
-            'connected_users': list(active_sse_connections.keys()),
-            'total_connections': sum(len(queues) for queues in active_sse_connections.values())
-        })
+    # Monitoring scrapes this every second or so; serve the last body briefly
+    now = time.monotonic()
+    if sse_health_cache['body'] is not None and now - sse_health_cache['ts'] < SSE_HEALTH_CACHE_TTL:
+        return Response(sse_health_cache['body'], mimetype='application/json')
+
+    connections = dict(active_sse_connections)
+    body = orjson.dumps({
+        'active_connections': len(connections),
+        'connected_users': list(connections.keys()),
+        'total_connections': sum(len(queues) for queues in connections.values())
+    })
+    sse_health_cache['ts'] = now
+    sse_health_cache['body'] = body
+
+    return Response(body, mimetype='application/json')
 
 
 # ========================================
 # NOTIFICATION HELPER FUNCTIONS (UPDATED)
 # ========================================
 
+# Built once at import instead of per call
+INSERT_NOTIFICATION_SQL = text("""
+    INSERT INTO notifications 
+    (id, user_id, type, title, message, alert_id, alert_location, resolve_time, timestamp, `read`)
+    VALUES 
+    (:id, :user_id, :type, :title, :message, :alert_id, :alert_location, :resolve_time, :timestamp, :read)
+""")
+
 def save_notification(notification_data):
     """
-    Save notification to database AND send via SSE
+    Stage the notification INSERT on the current session. It commits together
+    with the caller's alert change; call publish_notification() after commit.
     """
-    try:
-        # Ensure all required fields exist
-        notification_data.setdefault('resolve_time', None)
-        
-        # Save to database
-        with db.engine.connect() as conn:
-            query = text("""
-                INSERT INTO notifications 
-                (id, user_id, type, title, message, alert_id, alert_location, resolve_time, timestamp, `read`)
-                VALUES 
-                (:id, :user_id, :type, :title, :message, :alert_id, :alert_location, :resolve_time, :timestamp, :read)
-            """)
-            conn.execute(query, notification_data)
-            conn.commit()
-        
-        print(f"✅ Notification saved: {notification_data['id']}")
-        
-        # 🔥 NEW: Send via SSE to connected clients
-        user_id = notification_data.get('user_id')
-        if user_id and user_id != 'unknown':
-            send_sse_notification(user_id, notification_data)
-            print(f"📡 SSE notification broadcasted to user {user_id}")
-        
-    except Exception as e:
-        print(f"❌ Error saving notification: {e}")
-        traceback.print_exc()
+    # Ensure all required fields exist
+    notification_data.setdefault('resolve_time', None)
+    notification_data.setdefault('alert_location', None)
+    
+    db.session.execute(INSERT_NOTIFICATION_SQL, notification_data)
+    return notification_data
 
 
-def get_notifications_by_user(user_id):
-    """Get all notifications for a user"""
-    try:
-        with db.engine.connect() as conn:
-            query = text("""
-                SELECT * FROM notifications 
-                WHERE user_id = :user_id 
-                ORDER BY timestamp DESC
-            """)
-            result = conn.execute(query, {'user_id': user_id})
-            
-            notifications = []
-            for row in result:
-                notifications.append({
-                    'id': row.id,
-                    'user_id': row.user_id,
-                    'type': row.type,
-                    'title': row.title,
-                    'message': row.message,
-                    'alertId': row.alert_id,
-                    'alertLocation': row.alert_location,
-                    'resolveTime': row.resolve_time,
-                    'timestamp': row.timestamp.isoformat() if row.timestamp else None,
-                    'read': bool(row.read)
-                })
-            
-            return notifications
-    except Exception as e:
-        print(f"❌ Error getting notifications: {e}")
-        return []
+def publish_notification(notification_data):
+    """Send a committed notification to the user's SSE connections"""
+    user_id = notification_data.get('user_id')
+    invalidate_notifications(user_id)
+    if user_id and user_id != 'unknown':
+        send_sse_notification(user_id, notification_data)
+        logger.info("📡 SSE notification broadcasted to user %s", user_id)
 
 
-def mark_notification_as_read(notification_id):
-    """Mark a notification as read"""
-    try:
-        with db.engine.connect() as conn:
-            query = text("""
-                UPDATE notifications 
-                SET `read` = TRUE 
-                WHERE id = :notification_id
-            """)
-            conn.execute(query, {'notification_id': notification_id})
-            conn.commit()
-        print(f"✅ Notification {notification_id} marked as read")
-    except Exception as e:
-        print(f"❌ Error marking notification as read: {e}")
+# math functions bound once, so haversine_distance skips the attribute lookups
+_sin, _cos, _asin, _sqrt, _radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
 
 
 def haversine_distance(coord1, coord2):
     """Calculate distance between two lat/lng coordinates in km"""
+    # The sin(x/2)**2 form is kept over (1 - cos x)/2, which loses precision
+    # to cancellation at the short distances this app deals with.
     R = 6371  # Earth's radius in km
     
-    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
+    lat1, lon1 = _radians(coord1[0]), _radians(coord1[1])
+    lat2, lon2 = _radians(coord2[0]), _radians(coord2[1])
     
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
+    sin_dlat = _sin((lat2 - lat1) * 0.5)
+    sin_dlon = _sin((lon2 - lon1) * 0.5)
     
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
+    a = sin_dlat * sin_dlat + _cos(lat1) * _cos(lat2) * sin_dlon * sin_dlon
     
-    return R * c
-
-
+    return 2 * R * _asin(_sqrt(a))
 
 
 # ========================================
 # DIJKSTRA ROUTE
 # ========================================
 
+# Fire station coordinates
+FIRE_STATION_COORDS = (8.476723719070502, 123.7970718508905)
+
+# OpenRouteService API endpoint for GeoJSON response
+ORS_DIRECTIONS_URL = "https://api.openrouteservice.org/v2/directions/driving-car/geojson"
+
+# Read once at import (after load_dotenv) instead of on every route request
+ORS_API_KEY = os.getenv('OPENROUTE_API_KEY')
+
+# Alert coordinates are rounded to this many decimals (~11 m) for the route cache
+ROUTE_CACHE_PRECISION = 4
+
+# Shared session so ORS requests reuse pooled keep-alive TLS connections
+ors_session = requests.Session()
+ors_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, allowed_methods=None)
+))
+
+
+class RoutingServiceError(Exception):
+    """Non-200 response from OpenRouteService"""
+
+    def __init__(self, status_code, error_data):
+        super().__init__(f"ORS API error {status_code}")
+        self.status_code = status_code
+        self.error_data = error_data
+
+
+def fetch_ors_route(alert_lat, alert_lng, api_key):
+    """Fetch the fire station -> alert route from OpenRouteService"""
+    headers = {
+        'Authorization': api_key,
+        'Content-Type': 'application/json'
+    }
+    
+    # Coordinates must be in [longitude, latitude] format for ORS
+    body = {
+        "coordinates": [
+            [FIRE_STATION_COORDS[1], FIRE_STATION_COORDS[0]],  # Fire station [lng, lat]
+            [alert_lng, alert_lat]  # Alert location [lng, lat]
+        ],
+        "instructions": False,
+        "elevation": False
+    }
+    
+    logger.info("📡 Sending request to OpenRouteService...")
+    
+    # Make API request with timeout
+    response = ors_session.post(ORS_DIRECTIONS_URL, json=body, headers=headers, timeout=10)
+    
+    if response.status_code != 200:
+        error_data = response.json() if response.content else {}
+        raise RoutingServiceError(response.status_code, error_data)
+    
+    return orjson.loads(response.content)
+
+
+@lru_cache(maxsize=2048)
+def cached_route(alert_lat, alert_lng, api_key):
+    """
+    Route to an alert location, reduced to what the endpoint returns:
+    (route points as pre-serialized JSON array items, point count,
+    distance in meters, duration in seconds), or None when ORS finds no route.
+    Callers pass coordinates rounded to ROUTE_CACHE_PRECISION so repeat
+    lookups for the same location skip both the ORS call and the point
+    conversion. Errors raise and are therefore never cached.
+    """
+    data = fetch_ors_route(alert_lat, alert_lng, api_key)
+    
+    # GeoJSON response has features array
+    if 'features' not in data or len(data['features']) == 0:
+        return None
+    
+    # Extract route information from GeoJSON
+    feature = data['features'][0]
+    route_geometry = feature['geometry']['coordinates']
+    route_summary = feature['properties'].get('summary', {})
+    
+    # Convert from [lng, lat] to {lat, lng}, with every 5th point marked as
+    # junction for visualization; stored as "{...},{...}" ready to splice
+    points = orjson.dumps([
+        {'lat': coord[1], 'lng': coord[0], 'isJunction': i % 5 == 0}
+        for i, coord in enumerate(route_geometry)
+    ])[1:-1]
+    
+    return points, len(route_geometry), route_summary.get('distance', 0), route_summary.get('duration', 0)
+
+
 @app.route('/get_alert_route', methods=['GET', 'OPTIONS'])
 def get_alert_route():
     """Calculate shortest route using OpenRouteService API (OpenStreetMap data)"""
-    if request.method == 'OPTIONS':
-        return '', 204
-    
     try:
         alert_lat = float(request.args.get('lat'))
         alert_lng = float(request.args.get('lng'))
         
-        print(f"🚒 Calculating route to: {alert_lat}, {alert_lng}")
+        logger.info("🚒 Calculating route to: %s, %s", alert_lat, alert_lng)
         
-        # Fire station coordinates
-        fire_station_coords = [8.476723719070502, 123.7970718508905]
+        fire_station_coords = FIRE_STATION_COORDS
         
-        # Get API key from environment
-        api_key = os.getenv('OPENROUTE_API_KEY')
+        # API key from environment (read at startup)
+        api_key = ORS_API_KEY
         
         if not api_key:
-            print("⚠️ OPENROUTE_API_KEY not set in environment")
+            logger.warning("⚠️ OPENROUTE_API_KEY not set in environment")
             return jsonify({
                 'success': False,
                 'error': 'OpenRouteService API key not configured. Please add OPENROUTE_API_KEY to your .env file'
             }), 500
         
-        # OpenRouteService API endpoint for GeoJSON response
-        url = "https://api.openrouteservice.org/v2/directions/driving-car/geojson"
-        
-        headers = {
-            'Authorization': api_key,
-            'Content-Type': 'application/json'
-        }
-        
-        # Coordinates must be in [longitude, latitude] format for ORS
-        body = {
-            "coordinates": [
-                [fire_station_coords[1], fire_station_coords[0]],  # Fire station [lng, lat]
-                [alert_lng, alert_lat]  # Alert location [lng, lat]
-            ],
-            "instructions": False,
-            "elevation": False
-        }
-        
-        print(f"📡 Sending request to OpenRouteService...")
-        
-        # Make API request with timeout
-        response = requests.post(url, json=body, headers=headers, timeout=10)
-        
-        if response.status_code != 200:
-            error_data = response.json() if response.content else {}
-            print(f"❌ ORS API error {response.status_code}: {error_data}")
+        try:
+            route = cached_route(
+                round(alert_lat, ROUTE_CACHE_PRECISION),
+                round(alert_lng, ROUTE_CACHE_PRECISION),
+                api_key
+            )
+        except RoutingServiceError as e:
+            logger.error("❌ ORS API error %s: %s", e.status_code, e.error_data)
             
-            if response.status_code == 401:
+            if e.status_code == 401:
                 error_msg = 'Invalid API key. Please check your OPENROUTE_API_KEY'
-            elif response.status_code == 403:
+            elif e.status_code == 403:
                 error_msg = 'API key quota exceeded or forbidden'
-            elif response.status_code == 404:
+            elif e.status_code == 404:
                 error_msg = 'No route found between these locations'
             else:
-                error_msg = f'Routing service error: {response.status_code}'
+                error_msg = f'Routing service error: {e.status_code}'
             
             return jsonify({
                 'success': False,
                 'error': error_msg
-            }), response.status_code
+            }), e.status_code
         
-        data = response.json()
-        
-        # GeoJSON response has features array
-        if 'features' not in data or len(data['features']) == 0:
-            print(f"❌ No routes found in response")
+        if route is None:
+            logger.error("❌ No routes found in response")
             return jsonify({
                 'success': False,
                 'error': 'No route found between these locations'
             }), 404
         
-        # Extract route information from GeoJSON
-        feature = data['features'][0]
-        route_geometry = feature['geometry']['coordinates']
-        route_properties = feature['properties']
-        route_summary = route_properties.get('summary', {})
+        points, point_count, distance_m, duration_seconds = route
         
         # Get distance and duration
-        distance_km = route_summary.get('distance', 0) / 1000  # Convert meters to km
-        duration_seconds = route_summary.get('duration', 0)
+        distance_km = distance_m / 1000  # Convert meters to km
         duration_minutes = duration_seconds / 60
         
-        # Convert route coordinates to our format
-        route_coords = []
-        
-        # Add fire station as first point
-        route_coords.append({
+        # Fire station first, then the cached route points, then the alert location
+        start = orjson.dumps({
             'lat': fire_station_coords[0],
             'lng': fire_station_coords[1],
             'label': 'Fire Station',
             'isStart': True
         })
-        
-        # Add all route points (convert from [lng, lat] to {lat, lng})
-        for i, coord in enumerate(route_geometry):
-            route_coords.append({
-                'lat': coord[1],
-                'lng': coord[0],
-                'isJunction': i % 5 == 0  # Mark every 5th point as junction for visualization
-            })
-        
-        # Add alert location as last point
-        route_coords.append({
+        end = orjson.dumps({
             'lat': alert_lat,
             'lng': alert_lng,
             'label': 'Fire Incident',
             'isEnd': True
         })
-        
-        print(f"✅ Route calculated successfully:")
-        print(f"   Distance: {distance_km:.2f} km")
-        print(f"   Duration: {duration_minutes:.1f} minutes")
-        print(f"   Route points: {len(route_coords)}")
-        
-        return jsonify({
-            'success': True,
-            'route': route_coords,
+        summary = orjson.dumps({
             'total_distance': round(distance_km, 2),
             'estimated_duration': round(duration_minutes, 1),
             'duration_seconds': round(duration_seconds),
             'source': 'OpenRouteService',
             'map_data': 'OpenStreetMap'
-        }), 200
+        })
+        
+        logger.info("✅ Route calculated successfully:")
+        logger.info("   Distance: %.2f km", distance_km)
+        logger.info("   Duration: %.1f minutes", duration_minutes)
+        logger.info("   Route points: %s", point_count + 2)
+        
+        body = b''.join((
+            b'{"success":true,"route":[', start, b',',
+            points, b',' if points else b'',
+            end, b'],', summary[1:]
+        ))
+        return Response(body, mimetype='application/json'), 200
         
     except requests.exceptions.Timeout:
-        print("❌ Request timeout")
+        logger.error("❌ Request timeout")
         return jsonify({
             'success': False,
             'error': 'Routing service request timed out. Please try again.'
         }), 504
         
     except requests.exceptions.RequestException as e:
-        print(f"❌ Network error: {e}")
+        logger.error("❌ Network error: %s", e)
         return jsonify({
             'success': False,
             'error': 'Could not connect to routing service. Please check your internet connection.'
         }), 503
         
     except ValueError as e:
-        print(f"❌ Invalid coordinates: {e}")
+        logger.error("❌ Invalid coordinates: %s", e)
         return jsonify({
             'success': False,
             'error': 'Invalid coordinates provided'
         }), 400
     
     except KeyError as e:
-        print(f"❌ Missing key in response: {e}")
+        logger.error("❌ Missing key in response: %s", e)
         return jsonify({
             'success': False,
             'error': f'Invalid response structure: missing {str(e)}'
         }), 500
         
     except Exception as e:
-        print(f"❌ Unexpected error calculating route: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Unexpected error calculating route: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+# Alert listings (/get_alerts, /get_resolved_alerts, /get_spam_alerts,
+# /get_user_alerts) are served by the alert blueprint in route/alert_route.py
+
+
 # ========================================
-# ALERTS ENDPOINTS
+# ADMIN ACTION ENDPOINTS (WITH SSE)
 # ========================================
 
-@app.route('/get_alerts', methods=['GET', 'OPTIONS'])
-def get_alerts():
-    if request.method == 'OPTIONS':
-        return '', 204
-        
-    try:
-        alerts = Alert.query.filter_by(resolved=False).order_by(Alert.timestamp.desc()).all()
-        
-        alerts_list = []
-        for alert in alerts:
-            alerts_list.append({
-                'id': alert.id,
-                'description': alert.description,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'location': alert.barangay,
-                'photo_filename': alert.photo_filename,
-                'video_filename': alert.video_filename,
-                'photo_url': alert.photo_filename,
-                'video_url': alert.video_filename,
-                'barangay': alert.barangay,
-                'reporter_name': alert.reporter_name,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'status': 'resolved' if alert.resolved else 'pending',
-                'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None,
-            })
-        
-        print(f"📋 Retrieved {len(alerts_list)} active alerts")
-        
-        return jsonify({
-            'alerts': alerts_list,
-            'count': len(alerts_list)
-        }), 200
-        
-    except Exception as e:
-        print("❌ Error fetching alerts:", str(e))
-        traceback.print_exc()
-        return jsonify({'message': 'Server error', 'error': str(e)}), 500
+def get_alert_summary(alert_id):
+    """
+    Fetch only the alert columns the admin actions need (owner, location,
+    media) as a lightweight row instead of hydrating the full Alert entity
+    """
+    return db.session.execute(
+        select(
+            Alert.id, Alert.user_id, Alert.barangay, Alert.latitude, Alert.longitude,
+            Alert.photo_filename, Alert.video_filename
+        ).where(Alert.id == alert_id)
+    ).first()
+
+
+def update_alert_fields(alert_id, **fields):
+    """Apply a single UPDATE to one alert; returns the number of rows matched"""
+    result = db.session.execute(
+        update(Alert).where(Alert.id == alert_id).values(**fields)
+    )
+    return result.rowcount
 
 
-@app.route('/get_resolved_alerts', methods=['GET', 'OPTIONS'])
-def get_resolved_alerts():
-    if request.method == 'OPTIONS':
-        return '', 204
-        
-    try:
-        resolved_alerts = Alert.query.filter_by(resolved=True).order_by(Alert.timestamp.desc()).all()
-        
-        alerts_list = []
-        for alert in resolved_alerts:
-            alerts_list.append({
-                'id': alert.id,
-                'description': alert.description,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'location': alert.barangay,
-                'photo_url': alert.photo_filename,
-                'video_url': alert.video_filename,
-                'barangay': alert.barangay,
-                'reporter_name': alert.reporter_name,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'resolvedAt': alert.resolved_at.isoformat() if alert.resolved_at else None,
-                'resolve_time': alert.resolve_time,
-                'status': 'Resolved'
-            })
-        
-        print(f"📋 Retrieved {len(alerts_list)} resolved alerts")
-        
-        return jsonify({
-            'resolved': alerts_list,
-            'count': len(alerts_list)
-        }), 200
-        
-    except Exception as e:
-        print("❌ Error fetching resolved alerts:", str(e))
-        traceback.print_exc()
-        return jsonify({
-            'resolved': [],
-            'count': 0
-        }), 200
+def delete_alert_row(alert_id):
+    """Delete one alert with a single DELETE statement"""
+    db.session.execute(delete(Alert).where(Alert.id == alert_id))
 
 
-# ========================================
-# ADMIN ACTION ENDPOINTS (WITH SSE)
-# ========================================
+def alert_location(alert):
+    """Human-readable alert location: the barangay, else the coordinates"""
+    return alert.barangay or f"{alert.latitude}, {alert.longitude}"
+
+
+# Notification ids: a random per-process prefix plus an in-process counter.
+# Unique across workers and restarts without an entropy read per id
+# (itertools.count's next() is atomic under the GIL).
+NOTIFICATION_ID_PREFIX = uuid.uuid4().hex[:16]
+notification_seq = itertools.count()
+
+
+def next_notification_id():
+    """Unique id for a new notification row"""
+    return f"{NOTIFICATION_ID_PREFIX}{next(notification_seq):x}"
+
+
+def build_notification(alert, type_, title, message, **extra):
+    """Notification payload for an alert's owner, stamped with this request's time"""
+    ph_iso = now_ph()[1]
+    notification = {
+        'id': next_notification_id(),
+        'user_id': str(alert.user_id) if alert.user_id else 'unknown',
+        'type': type_,
+        'title': title,
+        'message': message,
+        'alert_id': str(alert.id),
+        'alert_location': alert_location(alert),
+        'timestamp': ph_iso,
+        'read': False,
+        'resolve_time': None
+    }
+    notification.update(extra)
+    return notification
+
 
 @app.route('/respond_alert', methods=['POST', 'OPTIONS'])
 def respond_alert():
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
         data = request.json
         alert_id = data.get('alert_id')
@@ -589,52 +789,46 @@ def respond_alert():
         if not alert_id or not message:
             return jsonify({'error': 'Missing required fields'}), 400
         
-        alert = Alert.query.get(alert_id)
+        alert = get_alert_summary(alert_id)
         if not alert:
             return jsonify({'error': 'Alert not found'}), 404
         
+        ph_time = now_ph()[0]
+        
+        # Update alert with Philippine time
+        update_alert_fields(
+            alert_id,
+            admin_response=message,
+            responded_at=ph_time,  # ✅ FIXED
+            status='received'
+        )
+        
         if not alert.user_id:
-            print(f"⚠️ Warning: Alert {alert_id} has no user_id")
-            alert.admin_response = message
-            alert.responded_at = get_philippine_time()  # ✅ FIXED
-            alert.status = 'received'
             db.session.commit()
-            
+            invalidate_alerts()
+            logger.warning("⚠️ Warning: Alert %s has no user_id", alert_id)
             return jsonify({
                 'success': True,
                 'message': 'Response saved (no user to notify)'
             }), 200
         
-        # Update alert with Philippine time
-        alert.admin_response = message
-        alert.responded_at = get_philippine_time()  # ✅ FIXED
-        alert.status = 'received'
+        # Alert update and notification insert commit as one transaction
+        notification = save_notification(
+            build_notification(alert, 'response', '🚒 Fire Station Response', message)
+        )
         db.session.commit()
-        
-        # Create notification with Philippine time
-        notification_data = {
-            'id': f'notif_{alert_id}_{get_philippine_timestamp()}',  # ✅ FIXED
-            'user_id': str(alert.user_id),
-            'type': 'response',
-            'title': '🚒 Fire Station Response',
-            'message': message,
-            'alert_id': str(alert_id),
-            'alert_location': alert.barangay or f"{alert.latitude}, {alert.longitude}",
-            'timestamp': get_philippine_time_iso(),  # ✅ FIXED
-            'read': False,
-            'resolve_time': None
-        }
-        
-        save_notification(notification_data)
+        invalidate_alerts()
+        publish_notification(notification)
 
-        send_push_notification(
+        run_in_background(
+            send_push_notification,
             user_id=alert.user_id,
             title='🚒 Fire Station Response',
             message=message,
             data={'alert_id': str(alert_id), 'type': 'response'}
         )
         
-        print(f"✅ Real-time notification sent to user {alert.user_id}")
+        logger.info("✅ Real-time notification sent to user %s", alert.user_id)
         
         return jsonify({
             'success': True,
@@ -643,17 +837,13 @@ def respond_alert():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error responding to alert: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error responding to alert: %s", e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/resolve_alert_with_time', methods=['POST', 'OPTIONS'])
 def resolve_alert_with_time():
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
         data = request.json
         alert_id = data.get('alert_id')
@@ -662,41 +852,38 @@ def resolve_alert_with_time():
         if not alert_id or not resolve_time:
             return jsonify({'error': 'Missing required fields'}), 400
         
-        alert = Alert.query.get(alert_id)
+        alert = get_alert_summary(alert_id)
         if not alert:
             return jsonify({'error': 'Alert not found'}), 404
         
+        ph_time = now_ph()[0]
+        
         # Update alert with Philippine time
-        alert.status = 'resolved'
-        alert.resolved = True
-        alert.resolved_at = get_philippine_time()  # ✅ FIXED
-        alert.resolve_time = resolve_time
+        update_alert_fields(
+            alert_id,
+            status='resolved',
+            resolved=True,
+            resolved_at=ph_time,  # ✅ FIXED
+            resolve_time=resolve_time
+        )
+        notification = save_notification(build_notification(
+            alert, 'resolved', '✅ Fire Alert Resolved',
+            f'Fire at {alert.barangay or "your location"} has been extinguished at {resolve_time}.',
+            resolve_time=resolve_time
+        ))
         db.session.commit()
-        
-        # Create notification with Philippine time
-        notification_data = {
-            'id': f'notif_{alert_id}_{get_philippine_timestamp()}',  # ✅ FIXED
-            'user_id': str(alert.user_id) if alert.user_id else 'unknown',
-            'type': 'resolved',
-            'title': '✅ Fire Alert Resolved',
-            'message': f'Fire at {alert.barangay or "your location"} has been extinguished at {resolve_time}.',
-            'alert_id': str(alert_id),
-            'alert_location': alert.barangay or f"{alert.latitude}, {alert.longitude}",
-            'resolve_time': resolve_time,
-            'timestamp': get_philippine_time_iso(),  # ✅ FIXED
-            'read': False
-        }
-        
-        save_notification(notification_data)
+        invalidate_alerts()
+        publish_notification(notification)
 
-        send_push_notification(
+        run_in_background(
+            send_push_notification,
             user_id=alert.user_id if alert.user_id else None,
             title='✅ Fire Alert Resolved',
             message=f'Fire at {alert.barangay or "your location"} has been extinguished at {resolve_time}.',
             data={'alert_id': str(alert_id), 'type': 'resolved'}
         )
         
-        print(f"✅ Alert {alert_id} resolved - real-time notification sent")
+        logger.info("✅ Alert %s resolved - real-time notification sent", alert_id)
         
         return jsonify({
             'success': True,
@@ -704,41 +891,34 @@ def resolve_alert_with_time():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error resolving alert: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error resolving alert: %s", e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/delete_alert/<alert_id>', methods=['DELETE', 'OPTIONS'])
 def delete_alert_new(alert_id):
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        alert = Alert.query.get(alert_id)
+        alert = get_alert_summary(alert_id)
         if not alert:
             return jsonify({'error': 'Alert not found'}), 404
         
         user_id = str(alert.user_id) if alert.user_id else 'unknown'
-        location = alert.barangay or f"{alert.latitude}, {alert.longitude}"
-        
-        # Create notification with Philippine time
-        notification_data = {
-            'id': f'notif_{alert_id}_{get_philippine_timestamp()}',  # ✅ FIXED
-            'user_id': user_id,
-            'type': 'deleted',
-            'title': '🗑️ Alert Removed',
-            'message': f'Your fire alert at {location} has been removed from the system.',
-            'alert_id': str(alert_id),
-            'timestamp': get_philippine_time_iso(),  # ✅ FIXED
-            'read': False,
-            'resolve_time': None
-        }
+        location = alert_location(alert)
+        
+        notification = save_notification(build_notification(
+            alert, 'deleted', '🗑️ Alert Removed',
+            f'Your fire alert at {location} has been removed from the system.'
+        ))
         
-        save_notification(notification_data)
+        # Delete from database
+        delete_alert_row(alert_id)
+        db.session.commit()
+        invalidate_alerts()
+        publish_notification(notification)
 
-        send_push_notification(
+        run_in_background(
+            send_push_notification,
             user_id=user_id,
             title='🗑️ Alert Removed',
             message=f'Your fire alert at {location} has been removed from the system.',
@@ -746,31 +926,9 @@ def delete_alert_new(alert_id):
         )
         
         # Delete media from Cloudinary
-        if alert.photo_filename and 'cloudinary.com' in alert.photo_filename:
-            try:
-                parts = alert.photo_filename.split('/')
-                if 'fire_alerts' in parts:
-                    idx = parts.index('fire_alerts')
-                    public_id = '/'.join(parts[idx:]).split('.')[0]
-                    delete_from_cloudinary(public_id, resource_type="image")
-            except Exception as e:
-                print(f"⚠️ Photo deletion failed: {e}")
-        
-        if alert.video_filename and 'cloudinary.com' in alert.video_filename:
-            try:
-                parts = alert.video_filename.split('/')
-                if 'fire_alerts' in parts:
-                    idx = parts.index('fire_alerts')
-                    public_id = '/'.join(parts[idx:]).split('.')[0]
-                    delete_from_cloudinary(public_id, resource_type="video")
-            except Exception as e:
-                print(f"⚠️ Video deletion failed: {e}")
+        delete_media(alert_media_ids(alert))
         
-        # Delete from database
-        db.session.delete(alert)
-        db.session.commit()
-        
-        print(f"✅ Alert {alert_id} deleted - real-time notification sent")
+        logger.info("✅ Alert %s deleted - real-time notification sent", alert_id)
         
         return jsonify({
             'success': True,
@@ -778,8 +936,7 @@ def delete_alert_new(alert_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error deleting alert: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error deleting alert: %s", e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -787,48 +944,43 @@ def delete_alert_new(alert_id):
 @app.route('/mark_spam/<alert_id>', methods=['POST', 'OPTIONS'])
 def mark_spam(alert_id):
     """Mark an alert as spam and move it to spam section"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        alert = Alert.query.get(alert_id)
+        alert = get_alert_summary(alert_id)
         if not alert:
             return jsonify({'error': 'Alert not found'}), 404
         
+        ph_time = now_ph()[0]
+        
         user_id = str(alert.user_id) if alert.user_id else 'unknown'
-        location = alert.barangay or f"{alert.latitude}, {alert.longitude}"
+        location = alert_location(alert)
         
         # Update alert status to spam
-        alert.status = 'spam'
-        alert.resolved = True  # Mark as resolved to remove from active alerts
-        alert.resolved_at = get_philippine_time()
-        
-        db.session.commit()
+        update_alert_fields(
+            alert_id,
+            status='spam',
+            resolved=True,  # Mark as resolved to remove from active alerts
+            resolved_at=ph_time
+        )
         
         # Create notification to inform user
-        notification_data = {
-            'id': f'notif_{alert_id}_{get_philippine_timestamp()}',
-            'user_id': user_id,
-            'type': 'spam',
-            'title': '⚠️ Alert Marked as Spam',
-            'message': f'Your fire alert at {location} has been marked as spam and removed from active alerts.',
-            'alert_id': str(alert_id),
-            'alert_location': location,
-            'timestamp': get_philippine_time_iso(),
-            'read': False,
-            'resolve_time': None
-        }
+        notification = save_notification(build_notification(
+            alert, 'spam', '⚠️ Alert Marked as Spam',
+            f'Your fire alert at {location} has been marked as spam and removed from active alerts.'
+        ))
         
-        save_notification(notification_data)
+        db.session.commit()
+        invalidate_alerts()
+        publish_notification(notification)
 
-        send_push_notification(
+        run_in_background(
+            send_push_notification,
             user_id=user_id,
             title='⚠️ Alert Marked as Spam',
             message=f'Your fire alert at {location} has been marked as spam.',
             data={'alert_id': str(alert_id), 'type': 'spam'}
         )
         
-        print(f"✅ Alert {alert_id} marked as spam - real-time notification sent")
+        logger.info("✅ Alert %s marked as spam - real-time notification sent", alert_id)
         
         return jsonify({
             'success': True,
@@ -836,92 +988,35 @@ def mark_spam(alert_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error marking alert as spam: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error marking alert as spam: %s", e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/get_spam_alerts', methods=['GET', 'OPTIONS'])
-def get_spam_alerts():
-    """Get all alerts marked as spam"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
-    try:
-        spam_alerts = Alert.query.filter_by(status='spam').order_by(Alert.timestamp.desc()).all()
-        
-        alerts_list = []
-        for alert in spam_alerts:
-            alerts_list.append({
-                'id': alert.id,
-                'description': alert.description,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'location': alert.barangay,
-                'photo_url': alert.photo_filename,
-                'video_url': alert.video_filename,
-                'barangay': alert.barangay,
-                'reporter_name': alert.reporter_name,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'markedSpamAt': alert.resolved_at.isoformat() if alert.resolved_at else None,
-                'status': 'Spam'
-            })
-        
-        print(f"📋 Retrieved {len(alerts_list)} spam alerts")
-        
-        return jsonify({
-            'spam': alerts_list,
-            'count': len(alerts_list)
-        }), 200
-        
-    except Exception as e:
-        print("❌ Error fetching spam alerts:", str(e))
-        traceback.print_exc()
-        return jsonify({
-            'spam': [],
-            'count': 0
-        }), 200
-
-
 @app.route('/restore_spam_alert/<alert_id>', methods=['POST', 'OPTIONS'])
 def restore_spam_alert(alert_id):
     """Restore an alert from spam back to active alerts"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        alert = Alert.query.get(alert_id)
+        alert = get_alert_summary(alert_id)
         if not alert:
             return jsonify({'error': 'Alert not found'}), 404
         
-        user_id = str(alert.user_id) if alert.user_id else 'unknown'
-        location = alert.barangay or f"{alert.latitude}, {alert.longitude}"
+        location = alert_location(alert)
         
         # Restore alert to pending status
-        alert.status = 'pending'
-        alert.resolved = False
-        alert.resolved_at = None
-        
-        db.session.commit()
+        update_alert_fields(alert_id, status='pending', resolved=False, resolved_at=None)
         
         # Create notification to inform user
-        notification_data = {
-            'id': f'notif_{alert_id}_{get_philippine_timestamp()}',
-            'user_id': user_id,
-            'type': 'restored',
-            'title': '✅ Alert Restored',
-            'message': f'Your fire alert at {location} has been restored and is now active again.',
-            'alert_id': str(alert_id),
-            'alert_location': location,
-            'timestamp': get_philippine_time_iso(),
-            'read': False,
-            'resolve_time': None
-        }
+        notification = save_notification(build_notification(
+            alert, 'restored', '✅ Alert Restored',
+            f'Your fire alert at {location} has been restored and is now active again.'
+        ))
         
-        save_notification(notification_data)
+        db.session.commit()
+        invalidate_alerts()
+        publish_notification(notification)
         
-        print(f"✅ Alert {alert_id} restored from spam - real-time notification sent")
+        logger.info("✅ Alert %s restored from spam - real-time notification sent", alert_id)
         
         return jsonify({
             'success': True,
@@ -929,8 +1024,7 @@ def restore_spam_alert(alert_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error restoring alert from spam: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error restoring alert from spam: %s", e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
@@ -938,40 +1032,20 @@ def restore_spam_alert(alert_id):
 @app.route('/delete_spam_alert/<alert_id>', methods=['DELETE', 'OPTIONS'])
 def delete_spam_alert(alert_id):
     """Permanently delete a spam alert"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        alert = Alert.query.get(alert_id)
+        alert = get_alert_summary(alert_id)
         if not alert:
             return jsonify({'error': 'Alert not found'}), 404
         
-        # Delete media from Cloudinary
-        if alert.photo_filename and 'cloudinary.com' in alert.photo_filename:
-            try:
-                parts = alert.photo_filename.split('/')
-                if 'fire_alerts' in parts:
-                    idx = parts.index('fire_alerts')
-                    public_id = '/'.join(parts[idx:]).split('.')[0]
-                    delete_from_cloudinary(public_id, resource_type="image")
-            except Exception as e:
-                print(f"⚠️ Photo deletion failed: {e}")
-        
-        if alert.video_filename and 'cloudinary.com' in alert.video_filename:
-            try:
-                parts = alert.video_filename.split('/')
-                if 'fire_alerts' in parts:
-                    idx = parts.index('fire_alerts')
-                    public_id = '/'.join(parts[idx:]).split('.')[0]
-                    delete_from_cloudinary(public_id, resource_type="video")
-            except Exception as e:
-                print(f"⚠️ Video deletion failed: {e}")
-        
         # Delete from database
-        db.session.delete(alert)
+        delete_alert_row(alert_id)
         db.session.commit()
+        invalidate_alerts()
+        
+        # Delete media from Cloudinary only once the row is really gone
+        delete_media(alert_media_ids(alert))
         
-        print(f"✅ Spam alert {alert_id} permanently deleted")
+        logger.info("✅ Spam alert %s permanently deleted", alert_id)
         
         return jsonify({
             'success': True,
@@ -979,128 +1053,84 @@ def delete_spam_alert(alert_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error deleting spam alert: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error deleting spam alert: %s", e)
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 
 
-@app.route('/get_user_alerts/<user_id>', methods=['GET', 'OPTIONS'])
-def get_user_alerts(user_id):
-    """Get all alerts for a specific user with their current status"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
-    try:
-        # 🔥 FIXED: Filter alerts by user_id
-        alerts = Alert.query.filter_by(user_id=user_id).order_by(Alert.timestamp.desc()).all()
-        
-        if not alerts:
-            return jsonify({
-                'success': True,
-                'alerts': [],
-                'message': 'No alerts found for this user'
-            }), 200
-        
-        alert_list = [
-            {
-                'id': alert.id,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'description': alert.description,
-                'reporter_name': alert.reporter_name,
-                'barangay': alert.barangay,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'photo_url': alert.photo_filename,
-                'video_url': alert.video_filename,
-                'admin_response': alert.admin_response,
-                'responded_at': alert.responded_at.isoformat() if alert.responded_at else None,
-                'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None,
-                'resolve_time': alert.resolve_time,
-                'status': alert.status or 'pending'
-            }
-            for alert in alerts
-        ]
-        
-        print(f"✅ Retrieved {len(alert_list)} alerts for user {user_id}")
-        
-        return jsonify({
-            'success': True,
-            'alerts': alert_list
-        }), 200
-        
-    except Exception as e:
-        print(f"❌ Error getting user alerts: {e}")
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
-
 # ========================================
 # EXISTING ENDPOINTS
 # ========================================
 
 @app.route('/resolve_alert/<int:alert_id>', methods=['POST', 'OPTIONS'])
 def resolve_alert(alert_id):
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        alert = Alert.query.get(alert_id)
-        if not alert:
+        if not update_alert_fields(alert_id, resolved=True, resolved_at=datetime.utcnow()):
             return jsonify({'message': 'Alert not found'}), 404
         
-        alert.resolved = True
-        alert.resolved_at = datetime.utcnow()
-        
         db.session.commit()
+        invalidate_alerts()
         
-        print(f"✅ Alert {alert_id} marked as resolved")
+        logger.info("✅ Alert %s marked as resolved", alert_id)
         return jsonify({
             'message': 'Alert marked as resolved',
             'alert_id': alert_id
         }), 200
         
     except Exception as e:
-        print("❌ Error resolving alert:", str(e))
-        traceback.print_exc()
+        logger.exception("❌ Error resolving alert: %s", e)
         db.session.rollback()
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
 
 @app.route('/unresolve_alert/<int:alert_id>', methods=['POST', 'OPTIONS'])
 def unresolve_alert(alert_id):
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        alert = Alert.query.get(alert_id)
-        if not alert:
+        if not update_alert_fields(alert_id, resolved=False, resolved_at=None):
             return jsonify({'message': 'Alert not found'}), 404
         
-        alert.resolved = False
-        alert.resolved_at = None
-        
         db.session.commit()
+        invalidate_alerts()
         
-        print(f"✅ Alert {alert_id} marked as unresolved")
+        logger.info("✅ Alert %s marked as unresolved", alert_id)
         return jsonify({
             'message': 'Alert marked as unresolved',
             'alert_id': alert_id
         }), 200
         
     except Exception as e:
-        print("❌ Error unresolving alert:", str(e))
-        traceback.print_exc()
+        logger.exception("❌ Error unresolving alert: %s", e)
         db.session.rollback()
         return jsonify({'message': 'Server error', 'error': str(e)}), 500
 
 
+# Uploaded media never changes under the same name, so let clients cache it
+UPLOADS_MAX_AGE = 86400
+# When nginx fronts the app, set this to its internal location for the uploads
+# folder so nginx streams the file with sendfile instead of Python
+UPLOADS_ACCEL_PREFIX = os.getenv('UPLOADS_ACCEL_PREFIX')
+
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
     try:
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        if UPLOADS_ACCEL_PREFIX:
+            path = safe_join(app.config['UPLOAD_FOLDER'], filename)
+            if not path or not os.path.isfile(path):
+                return jsonify({'message': 'File not found'}), 404
+            response = Response(mimetype=None)
+            # nginx reads this header as a URI, so ?, #, % and spaces must be escaped
+            response.headers['X-Accel-Redirect'] = f"{UPLOADS_ACCEL_PREFIX.rstrip('/')}/{quote(filename)}"
+            response.headers['Cache-Control'] = f'public, max-age={UPLOADS_MAX_AGE}'
+            return response
+        
+        return send_from_directory(
+            app.config['UPLOAD_FOLDER'], filename,
+            conditional=True, max_age=UPLOADS_MAX_AGE
+        )
     except Exception as e:
-        print(f"Error serving file {filename}:", e)
+        logger.error("Error serving file %s: %s", filename, e)
         return jsonify({'message': 'File not found'}), 404
 
 
@@ -1109,32 +1139,57 @@ def admin_resolve():
     return render_template('alertResolve.html')
 
 
+HEALTH_CACHE_TTL = 5  # seconds
+health_cache = {'ts': 0.0, 'payload': None}
+
+
 @app.route("/health")
 def health():
+    # Load balancers probe every few seconds; reuse the last result briefly
+    # instead of running SELECT 1 on every hit
+    now = time.monotonic()
+    if health_cache['payload'] is not None and now - health_cache['ts'] < HEALTH_CACHE_TTL:
+        return jsonify(health_cache['payload'])
+
     try:
         with db.engine.connect() as conn:
             conn.execute(text("SELECT 1"))
         db_status = "connected"
     except Exception as e:
-        print("DB ERROR:", e)
+        logger.error("DB ERROR: %s", e)
         db_status = "disconnected"
 
     cloudinary_status = "configured" if os.getenv('CLOUDINARY_CLOUD_NAME') else "not configured"
 
-    return jsonify({
+    payload = {
         "status": "healthy",
         "database": db_status,
         "cloudinary": cloudinary_status,
         "cors": "enabled",
         "sse": "enabled"
-    })
+    }
+    health_cache['ts'] = now
+    health_cache['payload'] = payload
+
+    return jsonify(payload)
+
+
+# InnoDB's row estimate: O(1), unlike COUNT(*) which scans an index.
+# Approximate, which is fine for a debug view.
+ALERT_ROW_ESTIMATE_SQL = text("""
+    SELECT table_rows FROM information_schema.tables
+    WHERE table_schema = DATABASE() AND table_name = 'alerts'
+""")
 
 
 @app.route('/admin/debug-alerts')
 def debug_alerts():
     """Debug what's in the database"""
     try:
-        all_alerts = Alert.query.order_by(Alert.timestamp.desc()).limit(5).all()
+        all_alerts = Alert.query.order_by(Alert.timestamp.desc()).with_entities(
+            Alert.id, Alert.timestamp, Alert.photo_filename, Alert.barangay,
+            Alert.reporter_name, Alert.resolved
+        ).limit(5).all()
         
         result = []
         for alert in all_alerts:
@@ -1149,7 +1204,7 @@ def debug_alerts():
             })
         
         return jsonify({
-            'total_alerts': Alert.query.count(),
+            'total_alerts': db.session.execute(ALERT_ROW_ESTIMATE_SQL).scalar(),
             'recent_5': result
         })
         
@@ -1173,6 +1228,7 @@ def create_notification():
     )
     db.session.add(notification)
     db.session.commit()
+    invalidate_notifications(user_id)
     
     return jsonify({
         'success': True,
@@ -1188,20 +1244,22 @@ def favicon():
 # PATCH - Mark notification as read
 @app.route('/api/notifications/<int:notification_id>/read', methods=['PATCH'])
 def mark_as_read(notification_id):
-    notification = Notification.query.get(notification_id)
+    notification = db.session.get(Notification, notification_id)
     if notification:
         notification.is_read = True
         db.session.commit()
+        invalidate_notifications(notification.user_id)
         return jsonify({'success': True})
     return jsonify({'error': 'Notification not found'}), 404
 
 # DELETE - Delete notification
 @app.route('/api/notifications/<int:notification_id>', methods=['DELETE'])
 def delete_notification(notification_id):
-    notification = Notification.query.get(notification_id)
+    notification = db.session.get(Notification, notification_id)
     if notification:
         db.session.delete(notification)
         db.session.commit()
+        invalidate_notifications(notification.user_id)
         return jsonify({'success': True})
     return jsonify({'error': 'Notification not found'}), 404
 
@@ -1210,7 +1268,7 @@ def delete_notification(notification_id):
 # Get admin profile
 @app.route('/admin/profile/<int:admin_id>', methods=['GET'])
 def get_admin_profile(admin_id):
-    admin = Admin.query.get(admin_id)
+    admin = db.session.get(Admin, admin_id)
     if not admin:
         return jsonify({'message': 'Admin not found'}), 404
     
@@ -1220,7 +1278,7 @@ def get_admin_profile(admin_id):
 @app.route('/admin/profile/<int:admin_id>', methods=['PUT'])
 def update_admin_profile(admin_id):
     data = request.get_json()
-    admin = Admin.query.get(admin_id)
+    admin = db.session.get(Admin, admin_id)
     
     if not admin:
         return jsonify({'message': 'Admin not found'}), 404
@@ -1245,7 +1303,7 @@ def upload_picture():
     file = request.files['profile_picture']
     admin_id = request.form.get('admin_id')
     
-    admin = Admin.query.get(admin_id)
+    admin = db.session.get(Admin, admin_id)
     if not admin:
         return jsonify({'message': 'Admin not found'}), 404
     
@@ -1295,12 +1353,25 @@ def keep_alive():
         "timestamp": get_philippine_time_iso()  # ✅ FIXED
     })
 # Create Tables
-with app.app_context():
+# Schema setup runs once per deploy (`flask --app app init-db`, invoked by the
+# gunicorn master) instead of on every worker import
+def create_tables():
+    """Create missing tables and indexes"""
     db.create_all()
-    print("✅ Database tables created/verified")
+    ensure_indexes()
+    logger.info("✅ Database tables created/verified")
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create missing database tables and indexes"""
+    create_tables()
+
 
 # Run App
 if __name__ == '__main__':
-    print("🚀 Starting Flask app...")
-    print(f"📍 Running on http://localhost:5000")
+    with app.app_context():
+        create_tables()
+    logger.info("🚀 Starting Flask app...")
+    logger.info("📍 Running on http://localhost:5000")
     app.run(port=5000, debug=True)
\ No newline at end of file
@@ -3,9 +3,22 @@ import cloudinary.uploader
 import os
 from dotenv import load_dotenv
 import sys
+import re
+import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# fire_alerts/... path segment of a Cloudinary URL, up to the file extension
+CLOUDINARY_PUBLIC_ID_RE = re.compile(r'cloudinary\.com/(?:.*?/)?(fire_alerts(?:/[^.]*)?)(?:\.|$)')
+
+# Uploads run here in parallel, and deletions fire-and-forget, so requests
+# don't wait on one Cloudinary round trip after another
+cloudinary_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='cloudinary')
+
 def init_cloudinary():
     """Initialize Cloudinary configuration"""
     cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME')
@@ -13,13 +26,13 @@ def init_cloudinary():
     api_secret = os.getenv('CLOUDINARY_API_SECRET')
     
     # Debug logging
-    print(f"🔍 Cloudinary Config Check:")
-    print(f"  Cloud Name: {'✅ Set' if cloud_name else '❌ Missing'}")
-    print(f"  API Key: {'✅ Set' if api_key else '❌ Missing'}")
-    print(f"  API Secret: {'✅ Set' if api_secret else '❌ Missing'}")
+    logger.info("🔍 Cloudinary Config Check:")
+    logger.info("  Cloud Name: %s", '✅ Set' if cloud_name else '❌ Missing')
+    logger.info("  API Key: %s", '✅ Set' if api_key else '❌ Missing')
+    logger.info("  API Secret: %s", '✅ Set' if api_secret else '❌ Missing')
     
     if not all([cloud_name, api_key, api_secret]):
-        print("❌ Missing Cloudinary credentials!")
+        logger.error("❌ Missing Cloudinary credentials!")
         sys.exit(1)
     
     cloudinary.config(
@@ -42,10 +55,10 @@ def upload_to_cloudinary(file, folder="fire_alerts", resource_type="auto"):
         dict: Upload result with secure_url and public_id
     """
     try:
-        print(f"🔄 Starting Cloudinary upload...")
-        print(f"  Folder: {folder}")
-        print(f"  Resource Type: {resource_type}")
-        print(f"  File: {file.filename if hasattr(file, 'filename') else 'Unknown'}")
+        logger.info("🔄 Starting Cloudinary upload...")
+        logger.info("  Folder: %s", folder)
+        logger.info("  Resource Type: %s", resource_type)
+        logger.info("  File: %s", file.filename if hasattr(file, 'filename') else 'Unknown')
         
         result = cloudinary.uploader.upload(
             file,
@@ -57,9 +70,9 @@ def upload_to_cloudinary(file, folder="fire_alerts", resource_type="auto"):
             ]
         )
         
-        print(f"✅ Upload successful!")
-        print(f"  URL: {result['secure_url']}")
-        print(f"  Public ID: {result['public_id']}")
+        logger.info("✅ Upload successful!")
+        logger.info("  URL: %s", result['secure_url'])
+        logger.info("  Public ID: %s", result['public_id'])
         
         return {
             'success': True,
@@ -67,15 +80,16 @@ def upload_to_cloudinary(file, folder="fire_alerts", resource_type="auto"):
             'public_id': result['public_id']
         }
     except Exception as e:
-        print(f"❌ Cloudinary upload error: {str(e)}")
-        print(f"  Error type: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Cloudinary upload error (%s): %s", type(e).__name__, e)
         return {
             'success': False,
             'error': str(e)
         }
 
+def upload_to_cloudinary_async(file, folder="fire_alerts", resource_type="auto"):
+    """Start an upload on the background pool; the Future resolves to upload_to_cloudinary's dict"""
+    return cloudinary_executor.submit(upload_to_cloudinary, file, folder, resource_type)
+
 def delete_from_cloudinary(public_id, resource_type="image"):
     """
     Delete a file from Cloudinary
@@ -88,16 +102,30 @@ def delete_from_cloudinary(public_id, resource_type="image"):
         dict: Result of deletion
     """
     try:
-        print(f"🗑️ Deleting from Cloudinary: {public_id}")
+        logger.info("🗑️ Deleting from Cloudinary: %s", public_id)
         result = cloudinary.uploader.destroy(public_id, resource_type=resource_type)
-        print(f"  Result: {result}")
+        logger.info("  Result: %s", result)
         return {
             'success': result['result'] == 'ok',
             'result': result
         }
     except Exception as e:
-        print(f"❌ Cloudinary deletion error: {str(e)}")
+        logger.error("❌ Cloudinary deletion error: %s", str(e))
         return {
             'success': False,
             'error': str(e)
-        }
\ No newline at end of file
+        }
+
+
+@lru_cache(maxsize=512)
+def cloudinary_public_id(url):
+    """Extract the Cloudinary public_id (fire_alerts/...) from a media URL, or None"""
+    if not url:
+        return None
+    match = CLOUDINARY_PUBLIC_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+def delete_from_cloudinary_async(public_id, resource_type="image"):
+    """Queue a deletion on the background pool; errors are logged by delete_from_cloudinary"""
+    return cloudinary_executor.submit(delete_from_cloudinary, public_id, resource_type)
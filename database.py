@@ -2,8 +2,10 @@
 
 from flask_sqlalchemy import SQLAlchemy
 from flask import Flask
+import logging
 
 db = SQLAlchemy()
+logger = logging.getLogger(__name__)
 
 def init_db(app: Flask):
     # Railway MySQL credentials (from your mysql command)
@@ -19,12 +21,37 @@ def init_db(app: Flask):
     )
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+    # Connection pool: reuse MySQL connections instead of a new handshake per query.
+    # Sized for one gevent worker serving many concurrent admin requests.
+    # (PyMySQL already folds executemany INSERTs into one multi-row statement.)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 20,
+        'max_overflow': 40,
+        'pool_recycle': 1800,  # Recycle before the server drops idle connections
+        'pool_pre_ping': True,  # Transparently replace dead connections
+        # Hand out the most recently used connection first: under light load the
+        # same few stay warm and the surplus idles out instead of going stale
+        'pool_use_lifo': True,
+    }
+
     db.init_app(app)
 
     # Optional: test connection
     try:
         with app.app_context():
-            db.engine.connect()
-            print("Connected to Railway MySQL successfully!")
+            with db.engine.connect():
+                pass
+            logger.info("Connected to Railway MySQL successfully!")
+            logger.info("Connection pool: %s", db.engine.pool.status())
     except Exception as e:
-        print("Database connection error:", e)
\ No newline at end of file
+        logger.error("Database connection error: %s", e)
+
+
+def ensure_indexes():
+    """
+    Create any model indexes missing from existing tables.
+    db.create_all() only creates indexes together with new tables.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
@@ -3,7 +3,7 @@ from model.alert_model import Alert
 
 with app.app_context():
     # Fix alert #152
-    alert152 = Alert.query.get(152)
+    alert152 = db.session.get(Alert, 152)
     if alert152:
         alert152.status = 'spam'
         print(f"✅ Fixed alert #152")
@@ -11,7 +11,7 @@ with app.app_context():
         print(f"⚠️  Alert #152 not found")
     
     # Fix alert #154
-    alert154 = Alert.query.get(154)
+    alert154 = db.session.get(Alert, 154)
     if alert154:
         alert154.status = 'spam'
         print(f"✅ Fixed alert #154")
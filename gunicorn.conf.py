@@ -0,0 +1,28 @@
+# gunicorn.conf.py
+# Loaded automatically by `gunicorn app:app` when started from this folder
+
+import os
+import subprocess
+import sys
+
+# gevent workers: every SSE client is a greenlet instead of an OS thread, so
+# one worker can hold thousands of idle /sse/notifications streams.
+# gunicorn monkey-patches queue/threading, so the SSE code needs no changes.
+worker_class = 'gevent'
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', '1000'))
+
+# SSE subscribers live in process memory, so a notification only reaches
+# clients connected to the same worker. Keep one worker unless that changes.
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+
+def on_starting(server):
+    """Create missing tables/indexes once in the master, before workers boot"""
+    # Set RUN_MIGRATIONS=0 when a deploy hook already ran `flask --app app init-db`
+    if os.getenv('RUN_MIGRATIONS', '1') != '1':
+        return
+    result = subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'])
+    if result.returncode != 0:
+        server.log.warning("init-db exited with status %s", result.returncode)
@@ -0,0 +1,25 @@
+# json_stream.py
+# Streaming JSON list responses for the blueprint listings
+
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def stream_json_list(key, items, label, head=None, tail=None):
+    """
+    Stream {"<key>": [...], "count": N} one item at a time so large result
+    sets are never held in memory as a full list. head fields are emitted
+    before the list; tail(count) may return extra fields to append after it.
+    """
+    yield (orjson.dumps(head)[:-1] + b',' if head else b'{') + f'"{key}":['.encode()
+    count = 0
+    for item in items:
+        if count:
+            yield b','
+        yield orjson.dumps(item)
+        count += 1
+    extra = tail(count) if tail else None
+    yield f'],"count":{count}'.encode() + (b',' + orjson.dumps(extra)[1:] if extra else b'}')
+    logger.info("📋 Retrieved %s %s", count, label)
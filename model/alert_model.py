@@ -29,4 +29,16 @@ class Alert(db.Model):
     status = db.Column(db.String(20), default='pending', nullable=True)
     
     # ✅ ADD THIS - Relationship to User
-    user = db.relationship('User', backref='alerts', lazy=True)
\ No newline at end of file
+    # Nothing reads alert.user today; lazy='raise' makes any future per-row
+    # access fail loudly instead of silently issuing one SELECT per alert.
+    # Load it explicitly with selectinload(Alert.user) where it's needed.
+    user = db.relationship('User', backref='alerts', lazy='raise')
+    __table_args__ = (
+        # Serve the admin/user listings "WHERE <col> = ? ORDER BY timestamp DESC"
+        # as index range scans instead of a full scan plus filesort
+        db.Index('ix_alerts_status_ts', status, timestamp.desc()),
+        db.Index('ix_alerts_user_ts', user_id, timestamp.desc()),
+        db.Index('ix_alerts_resolved_ts', resolved, timestamp.desc()),
+        # Resolved-alerts listing: "WHERE status = 'resolved' ORDER BY resolved_at DESC"
+        db.Index('ix_alerts_status_resolved', status, resolved_at.desc()),
+    )
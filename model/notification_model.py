@@ -14,4 +14,9 @@ class Notification(db.Model):
     alert_location = db.Column(db.String(200), nullable=True)
     resolve_time = db.Column(db.String(50), nullable=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    read = db.Column(db.Boolean, default=False, nullable=False)
\ No newline at end of file
+    read = db.Column(db.Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        # Serves "WHERE user_id = ? ORDER BY timestamp DESC" without a filesort
+        db.Index('ix_notif_user_ts', user_id, timestamp.desc(), id),
+    )
@@ -0,0 +1,53 @@
+# notification_cache.py
+# Per-user cache of the serialized /get_user_notifications response.
+# Every code path that writes the notifications table calls
+# invalidate_notifications() after its commit.
+
+import time
+from threading import Lock
+
+NOTIFICATION_CACHE_TTL = 60  # seconds
+NOTIFICATION_CACHE_MAXSIZE = 10000
+
+notification_cache = {}
+notification_cache_lock = Lock()
+
+# Bumped on every invalidation. A reader that started its query before a write
+# committed carries the old version, so its (possibly stale) result is not cached.
+notification_cache_version = 0
+
+
+def get_cached_notifications(user_id):
+    """Cached response body for user_id, or None on a miss/expired entry"""
+    entry = notification_cache.get(str(user_id))
+    if entry is None or time.monotonic() - entry[0] > NOTIFICATION_CACHE_TTL:
+        return None
+    return entry[1]
+
+
+def current_notification_version():
+    """Version to pass to cache_notifications() for a query started now"""
+    return notification_cache_version
+
+
+def cache_notifications(user_id, body, version):
+    """Store a response body unless the table changed since version was read"""
+    key = str(user_id)
+    with notification_cache_lock:
+        if version != notification_cache_version:
+            return
+        if key not in notification_cache and len(notification_cache) >= NOTIFICATION_CACHE_MAXSIZE:
+            # Evict the oldest insertion
+            notification_cache.pop(next(iter(notification_cache)))
+        notification_cache[key] = (time.monotonic(), body)
+
+
+def invalidate_notifications(user_id=None):
+    """Drop one user's cached list, or every user's when the owner is unknown"""
+    global notification_cache_version
+    with notification_cache_lock:
+        notification_cache_version += 1
+        if user_id is None:
+            notification_cache.clear()
+        else:
+            notification_cache.pop(str(user_id), None)
@@ -4,11 +4,15 @@
 
 import requests
 import os
+import logging
 from dotenv import load_dotenv
+from database import db
 from model.user import User
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 ONESIGNAL_APP_ID = os.getenv('ONESIGNAL_APP_ID')           # ← Add to your .env
 ONESIGNAL_API_KEY = os.getenv('ONESIGNAL_REST_API_KEY')    # ← Add to your .env
 
@@ -30,21 +34,21 @@ def send_push_notification(user_id, title, message, data=None):
     """
 
     if not ONESIGNAL_APP_ID or not ONESIGNAL_API_KEY:
-        print("⚠️ OneSignal: APP_ID or API_KEY not configured in .env")
+        logger.warning("⚠️ OneSignal: APP_ID or API_KEY not configured in .env")
         return {'success': False, 'error': 'OneSignal not configured'}
 
     # Look up the user's player_id from database
     try:
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user or not user.player_id:
-            print(f"⚠️ No player_id found for user {user_id}")
+            logger.warning("⚠️ No player_id found for user %s", user_id)
             return {'success': False, 'error': 'User has no player_id registered'}
         
         player_id = user.player_id
-        print(f"📤 Sending push to user {user_id} (player_id: {player_id})")
+        logger.info("📤 Sending push to user %s (player_id: %s)", user_id, player_id)
         
     except Exception as e:
-        print(f"❌ Error looking up player_id: {e}")
+        logger.error("❌ Error looking up player_id: %s", e)
         return {'success': False, 'error': f'Database error: {str(e)}'}
 
     headers = {
@@ -68,15 +72,15 @@ def send_push_notification(user_id, title, message, data=None):
 
         if response.status_code == 200:
             result = response.json()
-            print(f"✅ OneSignal push sent to user {user_id} | Recipients: {result.get('recipients', 0)}")
+            logger.info("✅ OneSignal push sent to user %s | Recipients: %s", user_id, result.get('recipients', 0))
             return {'success': True, 'response': result}
         else:
-            print(f"❌ OneSignal error {response.status_code}: {response.text}")
+            logger.error("❌ OneSignal error %s: %s", response.status_code, response.text)
             return {'success': False, 'error': response.text}
 
     except requests.exceptions.Timeout:
-        print("❌ OneSignal: Request timed out")
+        logger.error("❌ OneSignal: Request timed out")
         return {'success': False, 'error': 'Request timed out'}
     except Exception as e:
-        print(f"❌ OneSignal error: {e}")
+        logger.error("❌ OneSignal error: %s", e)
         return {'success': False, 'error': str(e)}
\ No newline at end of file
@@ -1,45 +1,48 @@
 from flask import Blueprint, request, jsonify
 from model.admin_model import Admin
 from database import db
+import logging
+
+logger = logging.getLogger(__name__)
 
 login_bp = Blueprint('login_bp', __name__)
 
 @login_bp.route('/login', methods=['POST'])
 def login():
-    print("=" * 50)
-    print("🔍 LOGIN ROUTE HIT!")
-    print("Content-Type:", request.content_type)
-    print("Raw Data:", request.data)
-    print("Form Data:", request.form)
-    print("=" * 50)
+    logger.info("🔍 LOGIN ROUTE HIT!")
+    # request.data/request.form read and parse the body even when DEBUG is off
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Content-Type: %s", request.content_type)
+        logger.debug("Raw Data: %s", request.data)
+        logger.debug("Form Data: %s", request.form)
     
     data = request.get_json(silent=True)
-    print("Parsed JSON:", data)
+    logger.debug("Parsed JSON: %s", data)
 
     if not data:
-        print("❌ No JSON data received!")
+        logger.error("❌ No JSON data received!")
         return jsonify({'message': 'Invalid JSON'}), 400
 
     email = data.get('email')
     password = data.get('password')
     
-    print(f"Email: {email}")
-    print(f"Password: {'***' if password else None}")
+    logger.info("Email: %s", email)
+    logger.info("Password: %s", '***' if password else None)
 
     if not email or not password:
-        print("❌ Missing email or password!")
+        logger.error("❌ Missing email or password!")
         return jsonify({'message': 'Email and password are required'}), 400
 
     admin = Admin.query.filter_by(email=email).first()
-    print(f"Admin found: {admin is not None}")
+    logger.info("Admin found: %s", admin is not None)
 
     if admin and admin.check_password(password):
-        print("✅ Login successful!")
+        logger.info("✅ Login successful!")
         return jsonify({
             'message': 'Login successful',
             'admin': admin.to_dict(),
             'token': 'dummy-token'
         }), 200
 
-    print("❌ Invalid credentials!")
+    logger.error("❌ Invalid credentials!")
     return jsonify({'message': 'Invalid credentials'}), 401
\ No newline at end of file
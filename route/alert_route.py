@@ -1,15 +1,78 @@
 # alert_route.py - COMPLETE VERSION WITH SPAM HANDLING FIX
-from flask import request, Blueprint, send_file, jsonify
+from flask import request, Blueprint, send_file, jsonify, Response, stream_with_context
 from database import db
 from model.alert_model import Alert
 import os
-import traceback
+import logging
 import json
 from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import update, delete
 
-from cloudinary_config import upload_to_cloudinary, delete_from_cloudinary
+from cloudinary_config import upload_to_cloudinary_async, cloudinary_public_id, delete_from_cloudinary_async
+from json_stream import stream_json_list
+from alert_cache import current_alerts_etag, invalidate_alerts
+from alert_pagination import paginate_alerts, next_page_cursor, track_last
 
 alert_bp = Blueprint('alert', __name__)
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def parse_media_urls(value):
+    """
+    Media column -> tuple of URLs. The column holds a JSON list, or a single
+    plain URL on older rows. Cached since the same rows are listed repeatedly.
+    """
+    if not value:
+        return ()
+    try:
+        urls = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return (value,)
+    return tuple(urls) if isinstance(urls, list) else (value,)
+
+
+def alert_media_ids(alert):
+    """(public_id, resource_type) of every Cloudinary photo/video of an alert"""
+    return [
+        (public_id, resource_type)
+        for column, resource_type in ((alert.photo_filename, "image"), (alert.video_filename, "video"))
+        for public_id in map(cloudinary_public_id, parse_media_urls(column))
+        if public_id
+    ]
+
+
+def start_uploads(files, folder, resource_type):
+    """Start uploading every non-empty file; returns (index, future) pairs"""
+    return [
+        (i, upload_to_cloudinary_async(file, folder=folder, resource_type=resource_type))
+        for i, file in enumerate(files)
+        if file and file.filename
+    ]
+
+
+def collect_uploads(uploads, label):
+    """Wait for started uploads; returns the URLs that succeeded, in file order"""
+    urls = []
+    for i, future in uploads:
+        try:
+            result = future.result()
+            if result['success']:
+                urls.append(result['url'])
+                logger.info("✅ %s %s uploaded: %s", label, i+1, result['url'])
+            else:
+                logger.error("❌ %s %s upload failed: %s", label, i+1, result['error'])
+        except Exception as e:
+            logger.exception("❌ Error uploading %s %s: %s", label.lower(), i+1, e)
+    return urls
+
+
+def delete_media(media_ids):
+    """Queue Cloudinary deletions on the background pool; does not wait"""
+    for public_id, resource_type in media_ids:
+        delete_from_cloudinary_async(public_id, resource_type=resource_type)
+
 
 BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_FOLDER = os.path.join(BACKEND_DIR, 'uploads')
@@ -21,9 +84,6 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # --------------------------
 @alert_bp.route('/send_alert', methods=['POST', 'OPTIONS'])
 def send_alert():
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
         description = request.form.get('description')
         latitude = request.form.get('latitude')
@@ -35,65 +95,30 @@ def send_alert():
         photos = request.files.getlist('photos')
         videos = request.files.getlist('videos')
 
-        print(f"📥 Received alert submission:")
-        print(f"  User ID: {user_id}")
-        print(f"  Description: {description}")
-        print(f"  Barangay: {barangay}")
-        print(f"  Reporter: {reporter_name}")
-        print(f"  Latitude: {latitude}, Longitude: {longitude}")
-        print(f"  Photos received: {len(photos)}")
-        print(f"  Videos received: {len(videos)}")
+        logger.info("📥 Received alert submission:")
+        logger.info("  User ID: %s", user_id)
+        logger.info("  Description: %s", description)
+        logger.info("  Barangay: %s", barangay)
+        logger.info("  Reporter: %s", reporter_name)
+        logger.info("  Latitude: %s, Longitude: %s", latitude, longitude)
+        logger.info("  Photos received: %s", len(photos))
+        logger.info("  Videos received: %s", len(videos))
 
         if not latitude or not longitude:
             return jsonify({'message': 'Location is required'}), 400
         if not photos and not videos:
             return jsonify({'message': 'At least one photo or video is required'}), 400
         if not user_id:
-            print("⚠️ Warning: No user_id provided!")
-
-        photo_urls = []
-        for i, photo in enumerate(photos):
-            if photo and photo.filename:
-                try:
-                    print(f"📤 Uploading photo {i+1}/{len(photos)}: {photo.filename}")
-                    photo_result = upload_to_cloudinary(
-                        photo, 
-                        folder="fire_alerts/photos", 
-                        resource_type="image"
-                    )
-                    
-                    if photo_result['success']:
-                        photo_url = photo_result['url']
-                        photo_urls.append(photo_url)
-                        print(f"✅ Photo {i+1} uploaded: {photo_url}")
-                    else:
-                        print(f"❌ Photo {i+1} upload failed: {photo_result['error']}")
-                        
-                except Exception as e:
-                    print(f"❌ Error uploading photo {i+1}: {e}")
-                    traceback.print_exc()
+            logger.warning("⚠️ Warning: No user_id provided!")
+
+        # Start every photo and video upload before waiting on any, so the
+        # request takes as long as the slowest upload rather than their sum
+        logger.info("📤 Uploading %s photo(s) and %s video(s)", len(photos), len(videos))
+        photo_uploads = start_uploads(photos, "fire_alerts/photos", "image")
+        video_uploads = start_uploads(videos, "fire_alerts/videos", "video")
         
-        video_urls = []
-        for i, video in enumerate(videos):
-            if video and video.filename:
-                try:
-                    print(f"📤 Uploading video {i+1}/{len(videos)}: {video.filename}")
-                    video_result = upload_to_cloudinary(
-                        video, 
-                        folder="fire_alerts/videos", 
-                        resource_type="video"
-                    )
-                    
-                    if video_result['success']:
-                        video_url = video_result['url']
-                        video_urls.append(video_url)
-                        print(f"✅ Video {i+1} uploaded: {video_url}")
-                    else:
-                        print(f"❌ Video {i+1} upload failed: {video_result['error']}")
-                        
-                except Exception as e:
-                    print(f"❌ Error uploading video {i+1}: {e}")
-                    traceback.print_exc()
+        photo_urls = collect_uploads(photo_uploads, "Photo")
+        video_urls = collect_uploads(video_uploads, "Video")
 
         if not photo_urls and not video_urls:
             return jsonify({
@@ -104,9 +129,9 @@ def send_alert():
         photo_urls_json = json.dumps(photo_urls) if photo_urls else None
         video_urls_json = json.dumps(video_urls) if video_urls else None
         
-        print(f"💾 Saving to database:")
-        print(f"  Photo URLs: {photo_urls_json}")
-        print(f"  Video URLs: {video_urls_json}")
+        logger.info("💾 Saving to database:")
+        logger.info("  Photo URLs: %s", photo_urls_json)
+        logger.info("  Video URLs: %s", video_urls_json)
 
         new_alert = Alert(
             user_id=int(user_id) if user_id else None,
@@ -124,11 +149,12 @@ def send_alert():
         
         db.session.add(new_alert)
         db.session.commit()
+        invalidate_alerts()
 
-        print("✅ Fire Alert Saved to Database!")
-        print(f"   Alert ID: {new_alert.id}")
-        print(f"   User ID: {new_alert.user_id}")
-        print(f"   Photos: {len(photo_urls)}, Videos: {len(video_urls)}")
+        logger.info("✅ Fire Alert Saved to Database!")
+        logger.info("   Alert ID: %s", new_alert.id)
+        logger.info("   User ID: %s", new_alert.user_id)
+        logger.info("   Photos: %s, Videos: %s", len(photo_urls), len(video_urls))
 
         return jsonify({
             'success': True,
@@ -143,8 +169,7 @@ def send_alert():
         }), 200
 
     except Exception as e:
-        print("❌ Error in send_alert:", str(e))
-        traceback.print_exc()
+        logger.exception("❌ Error in send_alert: %s", e)
         db.session.rollback()
         return jsonify({
             'success': False,
@@ -160,58 +185,67 @@ def send_alert():
 def get_alerts():
     """Return all active alerts (not resolved, not spam)"""
     try:
+        # Tag taken before the query: a write racing it bumps the version,
+        # so the next poll refetches instead of keeping stale data
+        etag = current_alerts_etag()
+        # Compression may suffix the tag (e.g. "...:gzip"), so compare the base
+        if etag in {tag.split(':', 1)[0] for tag in request.if_none_match.as_set(include_weak=True)}:
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
         # ✅ FIX: Only get alerts that are NOT resolved OR not spam
-        alerts = Alert.query.filter_by(resolved=False).order_by(Alert.timestamp.desc()).all()
+        query = Alert.query.filter_by(resolved=False).with_entities(
+            Alert.id, Alert.user_id, Alert.description, Alert.latitude, Alert.longitude,
+            Alert.barangay, Alert.reporter_name, Alert.photo_filename, Alert.video_filename,
+            Alert.timestamp, Alert.status, Alert.resolved, Alert.admin_response, Alert.responded_at
+        )
+        # Newest first; ?limit=&before=&before_id= return one page at a time
+        try:
+            query, limit = paginate_alerts(query)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid pagination parameters'}), 400
         
-        alerts_list = []
-        for alert in alerts:
-            photo_urls = []
-            if alert.photo_filename:
-                try:
-                    photo_urls = json.loads(alert.photo_filename)
-                    if not isinstance(photo_urls, list):
-                        photo_urls = [alert.photo_filename]
-                except (json.JSONDecodeError, TypeError):
-                    photo_urls = [alert.photo_filename]
-            
-            video_urls = []
-            if alert.video_filename:
-                try:
-                    video_urls = json.loads(alert.video_filename)
-                    if not isinstance(video_urls, list):
-                        video_urls = [alert.video_filename]
-                except (json.JSONDecodeError, TypeError):
-                    video_urls = [alert.video_filename]
+        last = [None]
+        alerts = track_last(query.yield_per(500), last)
+        
+        def serialize(rows):
+            for alert in rows:
+                photo_urls = parse_media_urls(alert.photo_filename)
+                video_urls = parse_media_urls(alert.video_filename)
             
-            alerts_list.append({
-                'id': alert.id,
-                'user_id': alert.user_id,
-                'description': alert.description,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'barangay': alert.barangay,
-                'reporter_name': alert.reporter_name,
-                'photo_urls': photo_urls,
-                'video_urls': video_urls,
-                'photo_url': photo_urls[0] if photo_urls else None,
-                'video_url': video_urls[0] if video_urls else None,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'status': alert.status or 'pending',
-                'resolved': alert.resolved,
-                'admin_response': alert.admin_response,
-                'responded_at': alert.responded_at.isoformat() if alert.responded_at else None
-            })
+                yield {
+                    'id': alert.id,
+                    'user_id': alert.user_id,
+                    'description': alert.description,
+                    'latitude': alert.latitude,
+                    'longitude': alert.longitude,
+                    'barangay': alert.barangay,
+                    'reporter_name': alert.reporter_name,
+                    'photo_urls': photo_urls,
+                    'video_urls': video_urls,
+                    'photo_url': photo_urls[0] if photo_urls else None,
+                    'video_url': video_urls[0] if video_urls else None,
+                    'timestamp': alert.timestamp,
+                    'status': alert.status or 'pending',
+                    'resolved': alert.resolved,
+                    'admin_response': alert.admin_response,
+                    'responded_at': alert.responded_at
+                }
         
-        print(f"📋 Retrieved {len(alerts_list)} active alerts")
-        return jsonify({
-            'success': True,
-            'alerts': alerts_list,
-            'count': len(alerts_list)
-        }), 200
+        response = Response(
+            stream_with_context(stream_json_list(
+                'alerts', serialize(alerts), 'active alerts', head={'success': True},
+                tail=lambda count: next_page_cursor(last[0], count, limit)
+            )),
+            mimetype='application/json'
+        )
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'  # Always revalidate
+        return response, 200
         
     except Exception as e:
-        print(f"❌ Error fetching alerts: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error fetching alerts: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -225,18 +259,20 @@ def get_alerts():
 def mark_spam(alert_id):
     """Mark an alert as spam"""
     try:
-        alert = Alert.query.get(alert_id)
-        if not alert:
-            return jsonify({'error': 'Alert not found'}), 404
-        
         # ✅ FIX: Set status to 'spam' (NOT 'resolved')
-        alert.status = 'spam'
-        alert.resolved = True  # Move it out of active alerts
-        alert.resolved_at = datetime.utcnow()
+        # resolved=True moves it out of active alerts
+        # One UPDATE instead of SELECT + UPDATE; rowcount tells us if it existed
+        result = db.session.execute(
+            update(Alert).where(Alert.id == alert_id)
+            .values(status='spam', resolved=True, resolved_at=datetime.utcnow())
+        )
+        if not result.rowcount:
+            return jsonify({'error': 'Alert not found'}), 404
         
         db.session.commit()
+        invalidate_alerts()
         
-        print(f"✅ Alert {alert_id} marked as SPAM (status: {alert.status})")
+        logger.info("✅ Alert %s marked as SPAM (status: spam)", alert_id)
         return jsonify({
             'success': True,
             'message': 'Alert marked as spam successfully',
@@ -245,8 +281,7 @@ def mark_spam(alert_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error marking alert as spam: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error marking alert as spam: %s", e)
         db.session.rollback()
         return jsonify({
             'success': False,
@@ -262,56 +297,53 @@ def get_spam_alerts():
     """Get all alerts marked as spam"""
     try:
         # ✅ Filter by status='spam'
-        spam_alerts = Alert.query.filter_by(status='spam').order_by(Alert.timestamp.desc()).all()
+        query = Alert.query.filter_by(status='spam').with_entities(
+            Alert.id, Alert.user_id, Alert.description, Alert.latitude, Alert.longitude,
+            Alert.barangay, Alert.reporter_name, Alert.photo_filename, Alert.video_filename,
+            Alert.timestamp, Alert.resolved_at
+        )
+        # Newest first; ?limit=&before=&before_id= return one page at a time
+        try:
+            query, limit = paginate_alerts(query)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid pagination parameters'}), 400
         
-        alerts_list = []
-        for alert in spam_alerts:
-            photo_urls = []
-            if alert.photo_filename:
-                try:
-                    photo_urls = json.loads(alert.photo_filename)
-                    if not isinstance(photo_urls, list):
-                        photo_urls = [alert.photo_filename]
-                except (json.JSONDecodeError, TypeError):
-                    photo_urls = [alert.photo_filename]
-            
-            video_urls = []
-            if alert.video_filename:
-                try:
-                    video_urls = json.loads(alert.video_filename)
-                    if not isinstance(video_urls, list):
-                        video_urls = [alert.video_filename]
-                except (json.JSONDecodeError, TypeError):
-                    video_urls = [alert.video_filename]
+        last = [None]
+        spam_alerts = track_last(query.yield_per(500), last)
+        
+        def serialize(rows):
+            for alert in rows:
+                photo_urls = parse_media_urls(alert.photo_filename)
+                video_urls = parse_media_urls(alert.video_filename)
             
-            alerts_list.append({
-                'id': alert.id,
-                'user_id': alert.user_id,
-                'description': alert.description,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'barangay': alert.barangay,
-                'reporter_name': alert.reporter_name,
-                'photo_urls': photo_urls,
-                'video_urls': video_urls,
-                'photo_url': photo_urls[0] if photo_urls else None,
-                'video_url': video_urls[0] if video_urls else None,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'status': 'spam',
-                'resolved': True,
-                'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None
-            })
+                yield {
+                    'id': alert.id,
+                    'user_id': alert.user_id,
+                    'description': alert.description,
+                    'latitude': alert.latitude,
+                    'longitude': alert.longitude,
+                    'barangay': alert.barangay,
+                    'reporter_name': alert.reporter_name,
+                    'photo_urls': photo_urls,
+                    'video_urls': video_urls,
+                    'photo_url': photo_urls[0] if photo_urls else None,
+                    'video_url': video_urls[0] if video_urls else None,
+                    'timestamp': alert.timestamp,
+                    'status': 'spam',
+                    'resolved': True,
+                    'resolved_at': alert.resolved_at
+                }
         
-        print(f"📋 Retrieved {len(alerts_list)} spam alerts")
-        return jsonify({
-            'success': True,
-            'alerts': alerts_list,
-            'count': len(alerts_list)
-        }), 200
+        return Response(
+            stream_with_context(stream_json_list(
+                'alerts', serialize(spam_alerts), 'spam alerts', head={'success': True},
+                tail=lambda count: next_page_cursor(last[0], count, limit)
+            )),
+            mimetype='application/json'
+        ), 200
         
     except Exception as e:
-        print(f"❌ Error fetching spam alerts: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error fetching spam alerts: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -324,17 +356,17 @@ def get_spam_alerts():
 @alert_bp.route('/resolve_alert/<int:alert_id>', methods=['POST'])
 def resolve_alert(alert_id):
     try:
-        alert = Alert.query.get(alert_id)
-        if not alert:
+        result = db.session.execute(
+            update(Alert).where(Alert.id == alert_id)
+            .values(status='resolved', resolved=True, resolved_at=datetime.utcnow())
+        )
+        if not result.rowcount:
             return jsonify({'error': 'Alert not found'}), 404
 
-        alert.status = 'resolved'
-        alert.resolved = True
-        alert.resolved_at = datetime.utcnow()
-
         db.session.commit()
+        invalidate_alerts()
 
-        print(f"✅ Alert {alert_id} marked RESOLVED")
+        logger.info("✅ Alert %s marked RESOLVED", alert_id)
 
         return jsonify({
             'success': True,
@@ -343,7 +375,7 @@ def resolve_alert(alert_id):
 
     except Exception as e:
         db.session.rollback()
-        print("❌ Resolve error:", e)
+        logger.error("❌ Resolve error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -358,58 +390,46 @@ def get_resolved_alerts():
         # This ensures we exclude both spam (status='spam') and pending (status='pending')
         resolved_alerts = Alert.query.filter(
             Alert.status == 'resolved'
-        ).order_by(Alert.resolved_at.desc()).all()
+        ).order_by(Alert.resolved_at.desc()).with_entities(
+            Alert.id, Alert.user_id, Alert.description, Alert.latitude, Alert.longitude,
+            Alert.barangay, Alert.reporter_name, Alert.photo_filename, Alert.video_filename,
+            Alert.timestamp, Alert.resolved_at, Alert.resolve_time, Alert.admin_response
+        ).yield_per(500)
         
-        alerts_list = []
-        for alert in resolved_alerts:
-            photo_urls = []
-            if alert.photo_filename:
-                try:
-                    photo_urls = json.loads(alert.photo_filename)
-                    if not isinstance(photo_urls, list):
-                        photo_urls = [alert.photo_filename]
-                except (json.JSONDecodeError, TypeError):
-                    photo_urls = [alert.photo_filename]
-            
-            video_urls = []
-            if alert.video_filename:
-                try:
-                    video_urls = json.loads(alert.video_filename)
-                    if not isinstance(video_urls, list):
-                        video_urls = [alert.video_filename]
-                except (json.JSONDecodeError, TypeError):
-                    video_urls = [alert.video_filename]
+        def serialize(rows):
+            for alert in rows:
+                photo_urls = parse_media_urls(alert.photo_filename)
+                video_urls = parse_media_urls(alert.video_filename)
             
-            alerts_list.append({
-                'id': alert.id,
-                'user_id': alert.user_id,
-                'description': alert.description,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'barangay': alert.barangay,
-                'reporter_name': alert.reporter_name,
-                'photo_urls': photo_urls,
-                'video_urls': video_urls,
-                'photo_url': photo_urls[0] if photo_urls else None,
-                'video_url': video_urls[0] if video_urls else None,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'status': 'resolved',
-                'resolved': True,
-                'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None,
-                'resolve_time': alert.resolve_time,
-                'admin_response': alert.admin_response
-            })
+                yield {
+                    'id': alert.id,
+                    'user_id': alert.user_id,
+                    'description': alert.description,
+                    'latitude': alert.latitude,
+                    'longitude': alert.longitude,
+                    'barangay': alert.barangay,
+                    'reporter_name': alert.reporter_name,
+                    'photo_urls': photo_urls,
+                    'video_urls': video_urls,
+                    'photo_url': photo_urls[0] if photo_urls else None,
+                    'video_url': video_urls[0] if video_urls else None,
+                    'timestamp': alert.timestamp,
+                    'status': 'resolved',
+                    'resolved': True,
+                    'resolved_at': alert.resolved_at,
+                    'resolve_time': alert.resolve_time,
+                    'admin_response': alert.admin_response
+                }
         
-        print(f"📋 Retrieved {len(alerts_list)} resolved alerts (excluding spam and pending)")
-        return jsonify({
-            'success': True,
-            'resolved': alerts_list,  # ✅ Changed from 'alerts' to 'resolved' to match your JS
-            'count': len(alerts_list)
-        }), 200
+        return Response(
+            stream_with_context(stream_json_list(
+                'resolved', serialize(resolved_alerts), 'resolved alerts (excluding spam and pending)', head={'success': True}
+            )),
+            mimetype='application/json'
+        ), 200
         
     except Exception as e:
-        print(f"❌ Error fetching resolved alerts: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error fetching resolved alerts: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -423,57 +443,56 @@ def get_resolved_alerts():
 def get_user_alerts(user_id):
     """Get all alerts for a specific user"""
     try:
-        alerts = Alert.query.filter_by(user_id=user_id).order_by(Alert.timestamp.desc()).all()
+        query = Alert.query.filter_by(user_id=user_id).with_entities(
+            Alert.id, Alert.latitude, Alert.longitude, Alert.description, Alert.reporter_name,
+            Alert.barangay, Alert.timestamp, Alert.photo_filename, Alert.video_filename,
+            Alert.admin_response, Alert.responded_at, Alert.resolved_at, Alert.resolve_time,
+            Alert.status, Alert.resolved
+        )
+        # Newest first; ?limit=&before=&before_id= return one page at a time
+        try:
+            query, limit = paginate_alerts(query)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid pagination parameters'}), 400
         
-        alerts_list = []
-        for alert in alerts:
-            photo_urls = []
-            if alert.photo_filename:
-                try:
-                    photo_urls = json.loads(alert.photo_filename)
-                    if not isinstance(photo_urls, list):
-                        photo_urls = [alert.photo_filename]
-                except (json.JSONDecodeError, TypeError):
-                    photo_urls = [alert.photo_filename]
-            
-            video_urls = []
-            if alert.video_filename:
-                try:
-                    video_urls = json.loads(alert.video_filename)
-                    if not isinstance(video_urls, list):
-                        video_urls = [alert.video_filename]
-                except (json.JSONDecodeError, TypeError):
-                    video_urls = [alert.video_filename]
+        last = [None]
+        alerts = track_last(query.yield_per(500), last)
+        
+        def serialize(rows):
+            for alert in rows:
+                photo_urls = parse_media_urls(alert.photo_filename)
+                video_urls = parse_media_urls(alert.video_filename)
             
-            alerts_list.append({
-                'id': alert.id,
-                'latitude': alert.latitude,
-                'longitude': alert.longitude,
-                'description': alert.description,
-                'reporter_name': alert.reporter_name,
-                'barangay': alert.barangay,
-                'timestamp': alert.timestamp.isoformat() if alert.timestamp else None,
-                'photo_urls': photo_urls,
-                'video_urls': video_urls,
-                'photo_url': photo_urls[0] if photo_urls else None,
-                'video_url': video_urls[0] if video_urls else None,
-                'admin_response': alert.admin_response,
-                'responded_at': alert.responded_at.isoformat() if alert.responded_at else None,
-                'resolved_at': alert.resolved_at.isoformat() if alert.resolved_at else None,
-                'resolve_time': alert.resolve_time,
-                'status': alert.status or 'pending',
-                'resolved': alert.resolved
-            })
+                yield {
+                    'id': alert.id,
+                    'latitude': alert.latitude,
+                    'longitude': alert.longitude,
+                    'description': alert.description,
+                    'reporter_name': alert.reporter_name,
+                    'barangay': alert.barangay,
+                    'timestamp': alert.timestamp,
+                    'photo_urls': photo_urls,
+                    'video_urls': video_urls,
+                    'photo_url': photo_urls[0] if photo_urls else None,
+                    'video_url': video_urls[0] if video_urls else None,
+                    'admin_response': alert.admin_response,
+                    'responded_at': alert.responded_at,
+                    'resolved_at': alert.resolved_at,
+                    'resolve_time': alert.resolve_time,
+                    'status': alert.status or 'pending',
+                    'resolved': alert.resolved
+                }
         
-        print(f"✅ Retrieved {len(alerts_list)} alerts for user {user_id}")
-        return jsonify({
-            'success': True,
-            'alerts': alerts_list
-        }), 200
+        return Response(
+            stream_with_context(stream_json_list(
+                'alerts', serialize(alerts), f'alerts for user {user_id}', head={'success': True},
+                tail=lambda count: next_page_cursor(last[0], count, limit)
+            )),
+            mimetype='application/json'
+        ), 200
         
     except Exception as e:
-        print(f"❌ Error getting user alerts: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error getting user alerts: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -487,52 +506,29 @@ def get_user_alerts(user_id):
 def delete_alert(alert_id):
     """Delete alert and its media from Cloudinary"""
     try:
-        alert = Alert.query.get(alert_id)
-        if not alert:
+        # Only the media columns are needed to clean up Cloudinary
+        media = Alert.query.filter_by(id=alert_id).with_entities(
+            Alert.photo_filename, Alert.video_filename
+        ).first()
+        if not media:
             return jsonify({'error': 'Alert not found'}), 404
         
-        if alert.photo_filename:
-            try:
-                photo_urls = json.loads(alert.photo_filename)
-                if isinstance(photo_urls, list):
-                    for photo_url in photo_urls:
-                        if 'cloudinary.com' in photo_url:
-                            parts = photo_url.split('/')
-                            if 'fire_alerts' in parts:
-                                idx = parts.index('fire_alerts')
-                                public_id = '/'.join(parts[idx:]).split('.')[0]
-                                delete_from_cloudinary(public_id, resource_type="image")
-                                print(f"🗑️ Deleted photo: {public_id}")
-            except:
-                pass
-        
-        if alert.video_filename:
-            try:
-                video_urls = json.loads(alert.video_filename)
-                if isinstance(video_urls, list):
-                    for video_url in video_urls:
-                        if 'cloudinary.com' in video_url:
-                            parts = video_url.split('/')
-                            if 'fire_alerts' in parts:
-                                idx = parts.index('fire_alerts')
-                                public_id = '/'.join(parts[idx:]).split('.')[0]
-                                delete_from_cloudinary(public_id, resource_type="video")
-                                print(f"🗑️ Deleted video: {public_id}")
-            except:
-                pass
-        
-        db.session.delete(alert)
+        media_ids = alert_media_ids(media)
+        db.session.execute(delete(Alert).where(Alert.id == alert_id))
         db.session.commit()
+        invalidate_alerts()
         
-        print(f"✅ Alert {alert_id} deleted")
+        # Media cleanup runs in the background once the row is gone
+        delete_media(media_ids)
+        
+        logger.info("✅ Alert %s deleted", alert_id)
         return jsonify({
             'success': True,
             'message': 'Alert deleted successfully'
         }), 200
         
     except Exception as e:
-        print(f"❌ Error deleting alert: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error deleting alert: %s", e)
         db.session.rollback()
         return jsonify({
             'success': False,
@@ -547,50 +543,26 @@ def delete_alert(alert_id):
 def clear_alerts(user_id):
     """Delete all alerts for a user"""
     try:
-        alerts = Alert.query.filter_by(user_id=user_id).all()
-        
-        for alert in alerts:
-            if alert.photo_filename:
-                try:
-                    photo_urls = json.loads(alert.photo_filename)
-                    if isinstance(photo_urls, list):
-                        for photo_url in photo_urls:
-                            if 'cloudinary.com' in photo_url:
-                                parts = photo_url.split('/')
-                                if 'fire_alerts' in parts:
-                                    idx = parts.index('fire_alerts')
-                                    public_id = '/'.join(parts[idx:]).split('.')[0]
-                                    delete_from_cloudinary(public_id, resource_type="image")
-                except:
-                    pass
-            
-            if alert.video_filename:
-                try:
-                    video_urls = json.loads(alert.video_filename)
-                    if isinstance(video_urls, list):
-                        for video_url in video_urls:
-                            if 'cloudinary.com' in video_url:
-                                parts = video_url.split('/')
-                                if 'fire_alerts' in parts:
-                                    idx = parts.index('fire_alerts')
-                                    public_id = '/'.join(parts[idx:]).split('.')[0]
-                                    delete_from_cloudinary(public_id, resource_type="video")
-                except:
-                    pass
-            
-            db.session.delete(alert)
+        media_rows = Alert.query.filter_by(user_id=user_id).with_entities(
+            Alert.photo_filename, Alert.video_filename
+        ).all()
         
+        media_ids = [media_id for media in media_rows for media_id in alert_media_ids(media)]
+        result = db.session.execute(delete(Alert).where(Alert.user_id == user_id))
         db.session.commit()
+        invalidate_alerts()
+        
+        delete_media(media_ids)
         
+        deleted = result.rowcount
         return jsonify({
             'success': True,
-            'message': f'Deleted {len(alerts)} alerts',
-            'count': len(alerts)
+            'message': f'Deleted {deleted} alerts',
+            'count': deleted
         }), 200
         
     except Exception as e:
-        print(f"❌ Error clearing alerts: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error clearing alerts: %s", e)
         db.session.rollback()
         return jsonify({
             'success': False,
@@ -1,13 +1,60 @@
 # notification_route.py - UPDATED with OneSignal Player ID endpoint
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from datetime import datetime
 from functools import wraps
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from database import db
 from model.user import User
-import traceback
+from notification_cache import (
+    get_cached_notifications, current_notification_version,
+    cache_notifications, invalidate_notifications
+)
+import logging
+import orjson
 
 notification_bp = Blueprint('notifications', __name__)
+logger = logging.getLogger(__name__)
+
+# SQL built once at import instead of per request. Statements run on
+# db.session, so each request reuses its one pooled connection.
+SELECT_USER_NOTIFICATIONS_SQL = text("""
+    SELECT id, user_id, type, title, message, alert_id, alert_location, resolve_time,
+           DATE_FORMAT(timestamp, '%Y-%m-%dT%H:%i:%s') AS timestamp_iso, `read`
+    FROM notifications 
+    WHERE user_id = :user_id 
+    ORDER BY timestamp DESC
+""")
+
+MARK_NOTIFICATION_READ_SQL = text("""
+    UPDATE notifications 
+    SET `read` = TRUE 
+    WHERE id = :notification_id
+""")
+
+MARK_ALL_READ_SQL = text("""
+    UPDATE notifications 
+    SET `read` = TRUE 
+    WHERE user_id = :user_id AND `read` = FALSE
+""")
+
+# Owners are read before a write so only their cached lists are invalidated
+SELECT_NOTIFICATION_OWNER_SQL = text("SELECT user_id FROM notifications WHERE id = :id")
+
+SELECT_NOTIFICATION_OWNERS_SQL = text(
+    "SELECT DISTINCT user_id FROM notifications WHERE id IN :ids"
+).bindparams(bindparam('ids', expanding=True))
+
+DELETE_NOTIFICATION_SQL = text("DELETE FROM notifications WHERE id = :id")
+
+UNREAD_COUNT_SQL = text("""
+    SELECT COUNT(*) as unread_count 
+    FROM notifications 
+    WHERE user_id = :user_id AND `read` = FALSE
+""")
+
+BULK_DELETE_NOTIFICATIONS_SQL = text(
+    "DELETE FROM notifications WHERE id IN :ids"
+).bindparams(bindparam('ids', expanding=True))
 
 # Simple auth check (you can enhance this later)
 def require_auth(f):
@@ -25,9 +72,6 @@ def require_auth(f):
 @notification_bp.route('/user/onesignal', methods=['POST', 'OPTIONS'])
 def save_onesignal_player_id():
     """Save OneSignal Player ID to user record"""
-    if request.method == 'OPTIONS':
-        return '', 204
-    
     try:
         data = request.get_json()
         user_id = data.get('user_id')
@@ -40,7 +84,7 @@ def save_onesignal_player_id():
             }), 400
         
         # Find user and update player_id
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({
                 'success': False,
@@ -50,7 +94,7 @@ def save_onesignal_player_id():
         user.player_id = player_id
         db.session.commit()
         
-        print(f"✅ Player ID saved for user {user_id}: {player_id}")
+        logger.info("✅ Player ID saved for user %s: %s", user_id, player_id)
         
         return jsonify({
             'success': True,
@@ -60,8 +104,7 @@ def save_onesignal_player_id():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error saving Player ID: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error saving Player ID: %s", e)
         db.session.rollback()
         return jsonify({
             'success': False,
@@ -75,42 +118,43 @@ def save_onesignal_player_id():
 @notification_bp.route('/get_user_notifications/<user_id>', methods=['GET', 'OPTIONS'])
 def get_user_notifications(user_id):
     """Get all notifications for a specific user"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        with db.engine.connect() as conn:
-            query = text("""
-                SELECT * FROM notifications 
-                WHERE user_id = :user_id 
-                ORDER BY timestamp DESC
-            """)
-            result = conn.execute(query, {'user_id': user_id})
-            
-            notifications = []
-            for row in result:
-                notifications.append({
-                    'id': row.id,
-                    'user_id': row.user_id,
-                    'type': row.type,
-                    'title': row.title,
-                    'message': row.message,
-                    'alertId': row.alert_id,
-                    'alertLocation': row.alert_location,
-                    'resolveTime': row.resolve_time,
-                    'timestamp': row.timestamp.isoformat() if row.timestamp else None,
-                    'read': bool(row.read)
-                })
-        
-        return jsonify({
+        cached = get_cached_notifications(user_id)
+        if cached is not None:
+            return Response(cached, mimetype='application/json'), 200
+        
+        version = current_notification_version()
+        result = db.session.execute(SELECT_USER_NOTIFICATIONS_SQL, {'user_id': user_id})
+        
+        notifications = [
+            {
+                'id': id_,
+                'user_id': row_user_id,
+                'type': type_,
+                'title': title,
+                'message': message,
+                'alertId': alert_id,
+                'alertLocation': alert_location,
+                'resolveTime': resolve_time,
+                'timestamp': timestamp_iso,
+                'read': bool(read)
+            }
+            # Unpack the fixed column order instead of Row attribute lookups
+            for id_, row_user_id, type_, title, message, alert_id, alert_location,
+                resolve_time, timestamp_iso, read in result
+        ]
+        
+        body = orjson.dumps({
             'success': True,
             'notifications': notifications,
             'count': len(notifications)
-        }), 200
+        })
+        cache_notifications(user_id, body, version)
+        
+        return Response(body, mimetype='application/json'), 200
         
     except Exception as e:
-        print(f"❌ Error getting notifications: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error getting notifications: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -123,20 +167,14 @@ def get_user_notifications(user_id):
 @notification_bp.route('/mark_notification_read/<notification_id>', methods=['POST', 'OPTIONS'])
 def mark_notification_read(notification_id):
     """Mark a specific notification as read"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        with db.engine.connect() as conn:
-            query = text("""
-                UPDATE notifications 
-                SET `read` = TRUE 
-                WHERE id = :notification_id
-            """)
-            conn.execute(query, {'notification_id': notification_id})
-            conn.commit()
+        owner = db.session.execute(SELECT_NOTIFICATION_OWNER_SQL, {'id': notification_id}).scalar()
+        db.session.execute(MARK_NOTIFICATION_READ_SQL, {'notification_id': notification_id})
+        db.session.commit()
+        if owner is not None:
+            invalidate_notifications(owner)
         
-        print(f"✅ Notification {notification_id} marked as read")
+        logger.info("✅ Notification %s marked as read", notification_id)
         
         return jsonify({
             'success': True,
@@ -144,8 +182,8 @@ def mark_notification_read(notification_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error marking notification as read: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error marking notification as read: %s", e)
+        db.session.rollback()
         return jsonify({
             'success': False,
             'error': str(e)
@@ -158,9 +196,6 @@ def mark_notification_read(notification_id):
 @notification_bp.route('/notifications/mark-all-read', methods=['POST', 'OPTIONS'])
 def mark_all_read():
     """Mark all notifications as read for a user"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
         data = request.get_json()
         user_id = data.get('user_id')
@@ -171,17 +206,12 @@ def mark_all_read():
                 'error': 'user_id is required'
             }), 400
         
-        with db.engine.connect() as conn:
-            query = text("""
-                UPDATE notifications 
-                SET `read` = TRUE 
-                WHERE user_id = :user_id AND `read` = FALSE
-            """)
-            result = conn.execute(query, {'user_id': user_id})
-            conn.commit()
-            updated_count = result.rowcount
+        result = db.session.execute(MARK_ALL_READ_SQL, {'user_id': user_id})
+        db.session.commit()
+        updated_count = result.rowcount
+        invalidate_notifications(user_id)
         
-        print(f"✅ Marked {updated_count} notifications as read for user {user_id}")
+        logger.info("✅ Marked %s notifications as read for user %s", updated_count, user_id)
         
         return jsonify({
             'success': True,
@@ -190,8 +220,8 @@ def mark_all_read():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error marking all as read: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error marking all as read: %s", e)
+        db.session.rollback()
         return jsonify({
             'success': False,
             'error': str(e)
@@ -204,27 +234,21 @@ def mark_all_read():
 @notification_bp.route('/<notification_id>', methods=['DELETE', 'OPTIONS'])
 def delete_notification(notification_id):
     """Delete a specific notification"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        with db.engine.connect() as conn:
-            # Check if notification exists
-            check_query = text("SELECT id FROM notifications WHERE id = :id")
-            result = conn.execute(check_query, {'id': notification_id})
-            
-            if not result.fetchone():
-                return jsonify({
-                    'success': False,
-                    'error': 'Notification not found'
-                }), 404
-            
-            # Delete notification
-            delete_query = text("DELETE FROM notifications WHERE id = :id")
-            conn.execute(delete_query, {'id': notification_id})
-            conn.commit()
+        # Check if notification exists (and whose list it is in)
+        owner = db.session.execute(SELECT_NOTIFICATION_OWNER_SQL, {'id': notification_id}).first()
+        if not owner:
+            return jsonify({
+                'success': False,
+                'error': 'Notification not found'
+            }), 404
         
-        print(f"✅ Notification {notification_id} deleted")
+        # Delete notification
+        db.session.execute(DELETE_NOTIFICATION_SQL, {'id': notification_id})
+        db.session.commit()
+        invalidate_notifications(owner.user_id)
+        
+        logger.info("✅ Notification %s deleted", notification_id)
         
         return jsonify({
             'success': True,
@@ -232,8 +256,8 @@ def delete_notification(notification_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error deleting notification: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error deleting notification: %s", e)
+        db.session.rollback()
         return jsonify({
             'success': False,
             'error': str(e)
@@ -246,19 +270,8 @@ def delete_notification(notification_id):
 @notification_bp.route('/count/<user_id>', methods=['GET', 'OPTIONS'])
 def get_unread_count(user_id):
     """Get count of unread notifications for a user"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
-        with db.engine.connect() as conn:
-            query = text("""
-                SELECT COUNT(*) as unread_count 
-                FROM notifications 
-                WHERE user_id = :user_id AND `read` = FALSE
-            """)
-            result = conn.execute(query, {'user_id': user_id})
-            row = result.fetchone()
-            unread_count = row.unread_count if row else 0
+        unread_count = db.session.execute(UNREAD_COUNT_SQL, {'user_id': user_id}).scalar() or 0
         
         return jsonify({
             'success': True,
@@ -267,8 +280,7 @@ def get_unread_count(user_id):
         }), 200
         
     except Exception as e:
-        print(f"❌ Error getting unread count: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error getting unread count: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -281,9 +293,6 @@ def get_unread_count(user_id):
 @notification_bp.route('/bulk-delete', methods=['POST', 'OPTIONS'])
 def bulk_delete_notifications():
     """Delete multiple notifications"""
-    if request.method == 'OPTIONS':
-        return '', 204
-        
     try:
         data = request.get_json()
         notification_ids = data.get('notification_ids', [])
@@ -294,17 +303,16 @@ def bulk_delete_notifications():
                 'error': 'notification_ids array is required'
             }), 400
         
-        with db.engine.connect() as conn:
-            # Convert list to comma-separated string for SQL IN clause
-            placeholders = ','.join([f':id_{i}' for i in range(len(notification_ids))])
-            params = {f'id_{i}': nid for i, nid in enumerate(notification_ids)}
-            
-            query = text(f"DELETE FROM notifications WHERE id IN ({placeholders})")
-            result = conn.execute(query, params)
-            conn.commit()
-            deleted_count = result.rowcount
+        # Expanding bind param renders the IN list, so the statement is built once
+        params = {'ids': list(notification_ids)}
+        owners = db.session.execute(SELECT_NOTIFICATION_OWNERS_SQL, params).scalars().all()
+        result = db.session.execute(BULK_DELETE_NOTIFICATIONS_SQL, params)
+        db.session.commit()
+        deleted_count = result.rowcount
+        for owner in owners:
+            invalidate_notifications(owner)
         
-        print(f"✅ Deleted {deleted_count} notifications")
+        logger.info("✅ Deleted %s notifications", deleted_count)
         
         return jsonify({
             'success': True,
@@ -313,8 +321,8 @@ def bulk_delete_notifications():
         }), 200
         
     except Exception as e:
-        print(f"❌ Error bulk deleting notifications: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error bulk deleting notifications: %s", e)
+        db.session.rollback()
         return jsonify({
             'success': False,
             'error': str(e)
@@ -8,6 +8,7 @@ from flask import Blueprint, request, jsonify
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 import os
+import logging
 
 from database import db
 from model.user import User
@@ -19,6 +20,7 @@ BREVO_EMAIL = os.getenv("BREVO_EMAIL")
 BREVO_SMTP_KEY = os.getenv("BREVO_SMTP_KEY")
 
 register_bp = Blueprint("register", __name__)
+logger = logging.getLogger(__name__)
 
 # Store OTPs temporarily in memory
 otp_store = {}
@@ -42,7 +44,7 @@ def clean_expired_otps():
 # -------------------------------
 def send_otp_email(receiver_email, otp):
     if not BREVO_SMTP_KEY:
-        print("❌ BREVO API KEY NOT SET")
+        logger.error("❌ BREVO API KEY NOT SET")
         return False
 
     url = "https://api.brevo.com/v3/smtp/email"
@@ -74,14 +76,14 @@ def send_otp_email(receiver_email, otp):
         )
 
         if response.status_code not in [200, 201, 202]:
-            print("❌ Brevo API Error:", response.text)
+            logger.error("❌ Brevo API Error: %s", response.text)
             return False
 
-        print(f"✅ OTP sent to {receiver_email}")
+        logger.info("✅ OTP sent to %s", receiver_email)
         return True
 
     except Exception as e:
-        print("❌ Brevo API Exception:", e)
+        logger.error("❌ Brevo API Exception: %s", e)
         return False
 
 # -------------------------------
@@ -117,7 +119,7 @@ def send_otp():
         }), 200
 
     except Exception as e:
-        print("❌ /send_otp ERROR:", e)
+        logger.error("❌ /send_otp ERROR: %s", e)
         return jsonify({"message": "Server error"}), 500
 
 # -------------------------------
@@ -170,5 +172,5 @@ def register():
 
     except Exception as e:
         db.session.rollback()
-        print("❌ /register ERROR:", e)
+        logger.error("❌ /register ERROR: %s", e)
         return jsonify({"message": "Registration failed"}), 500
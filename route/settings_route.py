@@ -3,6 +3,7 @@ import os
 from flask import Blueprint, request, jsonify, send_file
 from database import db
 from model.user import User
+from alert_cache import invalidate_alerts
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
@@ -59,6 +60,8 @@ def delete_account(user_id):
         # Delete user (cascade should handle related records if configured)
         db.session.delete(user)
         db.session.commit()
+        # The User.alerts backref nulls alerts.user_id, so the listing changed too
+        invalidate_alerts()
         
         return jsonify({
             "success": True,
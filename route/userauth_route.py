@@ -1,11 +1,14 @@
 # userauth_route.py
 import uuid
 import os
+import logging
 from flask import Blueprint, request, jsonify, send_file
 from database import db
 from model.user import User
+from alert_cache import invalidate_alerts
 
 auth_bp = Blueprint('auth_bp', __name__)
+logger = logging.getLogger(__name__)
 
 # --------------------------
 # LOGIN ROUTE (Gmail Only)
@@ -31,7 +34,7 @@ def login():
         # Generate token
         token = str(uuid.uuid4())
 
-        print(f"✅ User {user.fullname} logged in successfully")
+        logger.info("✅ User %s logged in successfully", user.fullname)
 
         return jsonify({
             "success": True,
@@ -47,7 +50,7 @@ def login():
         }), 200
 
     except Exception as e:
-        print(f"❌ Login error: {e}")
+        logger.error("❌ Login error: %s", e)
         return jsonify({"success": False, "message": "Server error"}), 500
 
 
@@ -81,7 +84,7 @@ def get_user_info(gmail):
 # --------------------------
 @auth_bp.route('/api/user/profile/<int:user_id>', methods=['GET'])
 def get_user_profile(user_id):
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     return jsonify({
@@ -100,7 +103,7 @@ def get_user_profile(user_id):
 @auth_bp.route('/api/user/profile/<int:user_id>', methods=['PUT'])
 def update_user_profile(user_id):
     data = request.json
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -124,7 +127,7 @@ def update_user_profile(user_id):
 @auth_bp.route('/api/user/change-password/<int:user_id>', methods=['PUT'])
 def change_password(user_id):
     data = request.json
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -145,7 +148,7 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 @auth_bp.route('/api/user/profile-picture/<int:user_id>', methods=['POST'])
 def change_profile_picture(user_id):
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -164,7 +167,7 @@ def change_profile_picture(user_id):
 # --------------------------
 @auth_bp.route('/api/user/notifications/<int:user_id>', methods=['PUT'])
 def update_notifications(user_id):
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     data = request.json
@@ -178,9 +181,11 @@ def update_notifications(user_id):
 # --------------------------
 @auth_bp.route('/api/user/<int:user_id>', methods=['DELETE'])
 def delete_account(user_id):
-    user = User.query.get(user_id)
+    user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
     db.session.delete(user)
     db.session.commit()
+    # The User.alerts backref nulls alerts.user_id, so the listing changed too
+    invalidate_alerts()
     return jsonify({"message": "Account deleted successfully"})
\ No newline at end of file
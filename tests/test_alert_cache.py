@@ -0,0 +1,27 @@
+import pytest
+
+from database import db
+from model.alert_model import Alert
+from model.user import User
+
+
+@pytest.mark.parametrize('url', ['/user/api/user/{id}', '/api/user/{id}'])
+def test_delete_account_invalidates_alerts_etag(client, url):
+    user = User(fullname='Reporter', gmail='reporter@example.com')
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(Alert(user_id=user.id, latitude=14.6, longitude=121.0))
+    db.session.commit()
+    user_id = user.id
+    
+    first = client.get('/get_alerts')
+    assert first.get_json()['alerts'][0]['user_id'] == user_id
+    etag = first.headers['ETag']
+    assert client.get('/get_alerts', headers={'If-None-Match': etag}).status_code == 304
+    
+    assert client.delete(url.format(id=user_id)).status_code == 200
+    
+    # The delete nulled alerts.user_id, so the old tag must no longer match
+    second = client.get('/get_alerts', headers={'If-None-Match': etag})
+    assert second.status_code == 200
+    assert second.get_json()['alerts'][0]['user_id'] is None
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from database import db
+from model.alert_model import Alert
+from model.user import User
+
+
+def add_alerts(user_id=None, count=3):
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    for i in range(count):
+        db.session.add(Alert(
+            user_id=user_id, description='x' * 200, latitude=14.6, longitude=121.0,
+            timestamp=now - timedelta(minutes=i), reporter_name='reporter'
+        ))
+    db.session.commit()
+
+
+def test_gzip_client_still_gets_streamed_listing(client):
+    add_alerts(count=20)
+    response = client.get('/get_alerts', headers={'Accept-Encoding': 'gzip'})
+    
+    assert response.status_code == 200
+    assert response.is_streamed
+    # A buffered (compressed) body would carry a Content-Length
+    assert 'Content-Length' not in response.headers
+    assert response.headers.get('Content-Encoding') != 'gzip'
+    assert response.get_json()['count'] == 20
+
+
+def test_streamed_listings_skip_compression(client):
+    user = User(fullname='Reporter', gmail='reporter@example.com')
+    db.session.add(user)
+    db.session.commit()
+    add_alerts(user_id=user.id, count=20)
+    
+    for url in ('/get_resolved_alerts', '/get_spam_alerts', f'/get_user_alerts/{user.id}'):
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200, url
+        assert 'Content-Length' not in response.headers, url
+        assert response.headers.get('Content-Encoding') != 'gzip', url
+